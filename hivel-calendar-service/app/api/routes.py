@@ -3,34 +3,73 @@ FastAPI routes for the calendar integration.
 Uses functional modules for auth, tokens, and calendar.
 """
 
-import os
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import RedirectResponse
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
+import hashlib
+import orjson
+from typing import Optional
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse, StreamingResponse
+from datetime import datetime, timedelta, timezone
 
 from app.auth import oauth
 from app.auth import token_manager
 from app.calendar import service as calendar_service
+from app.database.events import (
+    save_events, get_sync_tokens, save_sync_tokens, get_last_sync_times, save_last_sync_times,
+    invalidate_author_cache
+)
+from app.core.config import settings
 from app.core.logger import get_logger
-
-load_dotenv()
+from app.core.rate_limit import limiter, check_org_limit, INITIAL_SYNC_LIMIT
 
 # Get logger from centralized module
 logger = get_logger(__name__)
 
 # Config
-FRONTEND_SUCCESS_URL = os.getenv("FRONTEND_SUCCESS_URL", "http://localhost:3000")
+FRONTEND_SUCCESS_URL = settings().frontend_success_url
+
+# Calendar list per org: org_id -> (etag, response body bytes)
+_calendar_users_cache = TTLCache(maxsize=1000, ttl=600)
 
 router = APIRouter()
 
 
+def default_date_range(start_date, end_date):
+    """Fill in a missing start/end date (last 30 days, UTC)."""
+    if start_date and end_date:
+        return start_date, end_date
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if not start_date:
+        start_date = today - timedelta(days=30)
+    if not end_date:
+        end_date = today.replace(hour=23, minute=59, second=59)
+    return start_date, end_date
+
+
+def _tokens_to_save(sync_tokens, failed_calendars):
+    """
+    Sync tokens that may be persisted after a save: calendars with a
+    failed event keep their previously stored token, so the next sync
+    fetches those changes again.
+    """
+    if failed_calendars:
+        logger.warning(
+            "Not advancing sync tokens for %s calendars with failed events: %s",
+            len(failed_calendars), sorted(map(str, failed_calendars))
+        )
+    return {
+        calendar_id: token for calendar_id, token in sync_tokens.items()
+        if calendar_id not in failed_calendars
+    }
+
+
 # ============================================
 # OAUTH ENDPOINTS
 # ============================================
 
 @router.get("/auth/start")
-def start_oauth(org_id: int):
+@limiter.limit("10/minute")
+async def start_oauth(request: Request, org_id: int):
     """
     Start OAuth flow.
     Frontend calls this, we return the Google authorization URL.
@@ -42,7 +81,9 @@ def start_oauth(org_id: int):
 
 
 @router.get("/auth/callback")
-def oauth_callback(
+@limiter.limit("10/minute")
+async def oauth_callback(
+    request: Request,
     code: str = Query(...),
     state: str = Query(...)  # Contains org_id
 ):
@@ -52,23 +93,32 @@ def oauth_callback(
     We exchange code for tokens and store them (with AES encryption).
     """
     try:
-        logger.info(f"[CALLBACK] Received callback, state={state}")
+        logger.info("[CALLBACK] Received callback, state=%s", state)
         org_id = int(state)
         
         # Exchange code for tokens
-        logger.info(f"[CALLBACK] Exchanging code for tokens")
-        tokens = oauth.exchange_code_for_tokens(code)
-        logger.info(f"[CALLBACK] ✅ Got tokens")
+        logger.info("[CALLBACK] Exchanging code for tokens")
+        tokens = await oauth.exchange_code_for_tokens(code)
+        logger.info("[CALLBACK] ✅ Got tokens")
         
         # Fetch user email from Google
-        logger.info(f"[CALLBACK] Fetching user email")
-        user_info = oauth.get_user_info(tokens.get('access_token'))
+        logger.info("[CALLBACK] Fetching user email")
+        user_info = await oauth.get_user_info(tokens.get('access_token'))
         user_email = user_info.get('email')
-        logger.info(f"[CALLBACK] ✅ User email: {user_email}")
+        logger.info("[CALLBACK] ✅ User email: %s", user_email)
+        
+        # Re-auth: drop the previous connection's cached access token first,
+        # so it isn't served even if saving the new tokens fails
+        token_manager.invalidate_token(org_id)
         
         # Store tokens with email (with AES encryption)
-        token_manager.save_tokens(org_id, tokens, email=user_email)
-        logger.info(f"[CALLBACK] ✅ Tokens saved for org {org_id}")
+        await token_manager.save_tokens(org_id, tokens, email=user_email)
+        logger.info("[CALLBACK] ✅ Tokens saved for org %s", org_id)
+        
+        # Re-auth: don't trust author ids or the calendar users list
+        # cached from the previous connection
+        invalidate_author_cache(org_id)
+        _calendar_users_cache.pop(org_id, None)
         
         # Redirect to frontend success page
         return RedirectResponse(
@@ -76,9 +126,7 @@ def oauth_callback(
         )
         
     except Exception as e:
-        logger.error(f"[CALLBACK] ❌ Error: {e}")
-        import traceback
-        logger.error(f"[CALLBACK] Traceback:\n{traceback.format_exc()}")
+        logger.exception("[CALLBACK] ❌ Error: %s", e)
         return RedirectResponse(
             url=f"{FRONTEND_SUCCESS_URL}?status=error&message={str(e)}"
         )
@@ -89,44 +137,58 @@ def oauth_callback(
 # ============================================
 
 @router.get("/calendar/sync")
-def sync_calendar(
+async def sync_calendar(
     org_id: int,
-    start_date: str = None,
-    end_date: str = None,
-    save_to_db: bool = False  # Set True to save to database
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    save_to_db: bool = False,  # Set True to save to database
+    limit: Optional[int] = Query(None, ge=1),  # Optionally save only the first N events
+    incremental: bool = False  # Only fetch events changed since the last sync
 ):
     """
     Fetch calendar events for an organization.
     Only fetches from users the Marketplace admin permitted.
     
-    Example: GET /calendar/sync?org_id=123&start_date=2024-01-01T00:00:00Z&save_to_db=true
+    With incremental=true, calendars with a stored syncToken return only
+    events changed since the last sync. Tokens are advanced only when
+    fetched events are saved (save_to_db=true, no limit), and never for
+    calendars with an event that failed to save.
+    
+    Example: GET /calendar/sync?org_id=123&start_date=2024-01-01T00:00:00Z&save_to_db=true&limit=100
     """
     try:
         # Get valid access token (auto-refreshes if expired)
-        access_token = token_manager.get_valid_token(org_id)
+        access_token = await token_manager.get_valid_token(org_id)
         
         # Default date range
-        if not start_date:
-            start_date = (datetime.utcnow() - timedelta(days=30)).strftime("%Y-%m-%dT00:00:00Z")
-        if not end_date:
-            end_date = datetime.utcnow().strftime("%Y-%m-%dT23:59:59Z")
+        start_date, end_date = default_date_range(start_date, end_date)
         
         # Fetch all events
-        events = calendar_service.fetch_data(org_id, access_token, start_date, end_date)
+        run_started = datetime.now(timezone.utc)
+        sync_tokens = await get_sync_tokens(org_id) if incremental else {}
+        updated_mins = await get_last_sync_times(org_id) if incremental else {}
+        completed = set()
+        events = await calendar_service.fetch_data(
+            org_id, access_token, start_date, end_date,
+            sync_tokens=sync_tokens, updated_mins=updated_mins, completed=completed
+        )
         
         # Optionally save to database
         saved_count = 0
         if save_to_db:
-            from app.database.events import save_events
-            # TESTING: Limit to first 5 events
-            test_events = events[:5]
-            saved_count = save_events(test_events, org_id)
+            events_to_save = events[:limit] if limit is not None else events
+            result = await save_events(events_to_save, org_id)
+            saved_count = result.saved
+            if limit is None:
+                await save_sync_tokens(org_id, _tokens_to_save(sync_tokens, result.failed_calendars))
+                await save_last_sync_times(org_id, completed - result.failed_calendars, run_started)
         
         return {
             "status": "success",
             "org_id": org_id,
             "events_count": len(events),
             "saved_to_db": saved_count if save_to_db else "skipped",
+            "sync_type": "incremental" if incremental else "full",
             "events": events
         }
         
@@ -134,29 +196,69 @@ def sync_calendar(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/calendar/sync/stream")
+async def sync_calendar_stream(
+    org_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+):
+    """
+    Stream calendar events for an organization as NDJSON (one event per line).
+    Events are written as Google pages arrive, so large orgs never
+    materialize the full event list in memory.
+    
+    Example: GET /calendar/sync/stream?org_id=123&start_date=2024-01-01T00:00:00Z
+    """
+    try:
+        access_token = await token_manager.get_valid_token(org_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    start_date, end_date = default_date_range(start_date, end_date)
+    
+    async def ndjson_events():
+        async for event in calendar_service.iter_events(org_id, access_token, start_date, end_date):
+            yield orjson.dumps(event) + b"\n"
+    
+    return StreamingResponse(ndjson_events(), media_type="application/x-ndjson")
+
 
 @router.get("/calendar/users")
-def get_accessible_users(org_id: int):
+async def get_accessible_users(org_id: int, request: Request):
     """
     List all calendars we can access for this org.
     For Marketplace app, shows ONLY users the admin scoped.
+    The list is cached per org for 10 minutes and served with an ETag,
+    so clients sending If-None-Match get a 304 without a Google call.
     
     Example: GET /calendar/users?org_id=123
     """
-    try:
-        access_token = token_manager.get_valid_token(org_id)
-        service = calendar_service.build_calendar_service(access_token)
-        calendars = calendar_service.fetch_all_calendar_list(service)
+    cached = _calendar_users_cache.get(org_id)
+    if cached is None:
+        try:
+            access_token = await token_manager.get_valid_token(org_id)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        try:
+            calendars = await calendar_service.fetch_all_calendar_list(access_token)
+        except Exception as e:
+            # Google/network failure: report it and don't cache an empty list
+            raise HTTPException(status_code=502, detail=f"Failed to fetch calendars: {e}")
         
-        return {
+        body = orjson.dumps({
             "status": "success",
             "org_id": org_id,
             "accessible_calendars": calendars,
             "count": len(calendars)
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        })
+        etag = '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+        cached = _calendar_users_cache[org_id] = (etag, body)
+    
+    etag, body = cached
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # ============================================
@@ -164,13 +266,12 @@ def get_accessible_users(org_id: int):
 # ============================================
 
 from pydantic import BaseModel
-from typing import Optional
 
 class SyncQueryParams(BaseModel):
     orgId: int
     userIntegrationId: Optional[int] = None
-    startDate: str
-    endDate: str
+    startDate: datetime
+    endDate: datetime
     initialSync: bool = True
 
 class SyncRequest(BaseModel):
@@ -178,7 +279,7 @@ class SyncRequest(BaseModel):
 
 
 @router.post("/initial-sync")
-def initial_sync(request: SyncRequest):
+async def initial_sync(sync_request: SyncRequest):
     """
     Initial sync endpoint called by auth-svc.
     Matches the payload format expected by GoogleCalendarOAuthService.java
@@ -193,46 +294,68 @@ def initial_sync(request: SyncRequest):
             "initialSync": true
         }
     }
+    
+    initialSync=true does a full fetch of the date range; false fetches
+    only events changed since the last sync (per-calendar Google syncToken),
+    falling back to updatedMin=<start of the last run that fully fetched
+    and saved the calendar> within the date range for calendars without
+    a token, and to the full date range otherwise.
     """
-    params = request.queryStringParameters
+    params = sync_request.queryStringParameters
     org_id = params.orgId
+    check_org_limit(INITIAL_SYNC_LIMIT, "initial-sync", org_id)
     start_date = params.startDate
     end_date = params.endDate
+    sync_type = "full" if params.initialSync else "incremental"
     
-    logger.info(f"[SYNC START] org_id={org_id}, start_date={start_date}, end_date={end_date}, initial_sync={params.initialSync}")
+    logger.info("[SYNC START] org_id=%s, start_date=%s, end_date=%s, initial_sync=%s", org_id, start_date, end_date, params.initialSync)
     
     try:
         # Step 1: Get access token
-        logger.info(f"[STEP 1] Getting access token for org {org_id}")
-        access_token = token_manager.get_valid_token(org_id)
-        logger.info(f"[STEP 1] ✅ Access token retrieved successfully")
+        logger.info("[STEP 1] Getting access token for org %s", org_id)
+        access_token = await token_manager.get_valid_token(org_id)
+        logger.info("[STEP 1] ✅ Access token retrieved successfully")
         
-        # Step 2: Fetch events from Google Calendar
-        logger.info(f"[STEP 2] Fetching events from Google Calendar API")
-        events = calendar_service.fetch_data(org_id, access_token, start_date, end_date)
-        logger.info(f"[STEP 2] ✅ Fetched {len(events)} events from Google Calendar")
+        # Step 2: Stream events from Google Calendar and
+        # Step 3: save them to the database one batch at a time
+        logger.info("[STEP 2] Fetching events from Google Calendar API (%s sync)", sync_type)
+        run_started = datetime.now(timezone.utc)
+        sync_tokens = {} if params.initialSync else await get_sync_tokens(org_id)
+        updated_mins = {} if params.initialSync else await get_last_sync_times(org_id)
+        fetched_count = 0
+        saved_count = 0
+        failed_calendars = set()
+        completed = set()
+        async for events in calendar_service.iter_event_batches(
+            org_id, access_token, start_date, end_date,
+            sync_tokens=sync_tokens, updated_mins=updated_mins, completed=completed,
+            fields=calendar_service.SAVE_EVENT_FIELDS
+        ):
+            fetched_count += len(events)
+            result = await save_events(events, org_id)
+            saved_count += result.saved
+            failed_calendars |= result.failed_calendars
+            logger.info("[STEP 3] Saved %s/%s events to database so far", saved_count, fetched_count)
+        logger.info("[STEP 3] ✅ Saved %s/%s events to database", saved_count, fetched_count)
         
-        # Step 3: Save to database
-        logger.info(f"[STEP 3] Saving events to database")
-        from app.database.events import save_events
-        saved_count = save_events(events, org_id)
-        logger.info(f"[STEP 3] ✅ Saved {saved_count}/{len(events)} events to database")
+        # Only advance sync tokens once events are persisted
+        await save_sync_tokens(org_id, _tokens_to_save(sync_tokens, failed_calendars))
+        await save_last_sync_times(org_id, completed - failed_calendars, run_started)
         
         # Success
-        logger.info(f"[SYNC COMPLETE] org_id={org_id}, events_fetched={len(events)}, events_saved={saved_count}")
+        logger.info("[SYNC COMPLETE] org_id=%s, events_fetched=%s, events_saved=%s", org_id, fetched_count, saved_count)
         
         return {
             "status": "success",
             "org_id": org_id,
-            "events_fetched": len(events),
+            "events_fetched": fetched_count,
             "events_saved": saved_count,
-            "initial_sync": params.initialSync
+            "initial_sync": params.initialSync,
+            "sync_type": sync_type
         }
         
     except Exception as e:
-        logger.error(f"[SYNC ERROR] org_id={org_id}, error={str(e)}")
-        import traceback
-        logger.error(f"[SYNC ERROR] Traceback:\n{traceback.format_exc()}")
+        logger.exception("[SYNC ERROR] org_id=%s, error=%s", org_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -240,7 +363,11 @@ def initial_sync(request: SyncRequest):
 # HEALTH CHECK
 # ============================================
 
+_HEALTH_BODY = orjson.dumps({"status": "healthy", "service": "hivel-calendar"})
+_HEALTH_HEADERS = {"Cache-Control": "no-store"}
+
+
 @router.get("/health")
-def health_check():
-    """Simple health check endpoint"""
-    return {"status": "healthy", "service": "hivel-calendar"}
+async def health_check():
+    """Simple health check endpoint (never cached, probes must hit the pod)"""
+    return Response(content=_HEALTH_BODY, media_type="application/json", headers=_HEALTH_HEADERS)
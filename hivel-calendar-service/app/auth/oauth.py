@@ -3,21 +3,20 @@ OAuth functions for Google Calendar Marketplace integration.
 Functional style matching existing Hivel code.
 """
 
-import os
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 from google_auth_oauthlib.flow import Flow
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from dotenv import load_dotenv
+from app.core.config import settings
+from app.core.http import GOOGLE_CLIENT
 from app.core.logger import get_logger
 
-load_dotenv()
-
 logger = get_logger(__name__)
 
 # Config (loaded from environment)
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
-REDIRECT_URI = os.getenv("REDIRECT_URI", "http://localhost:8000/auth/callback")
+GOOGLE_CLIENT_ID = settings().google_client_id
+GOOGLE_CLIENT_SECRET = settings().google_client_secret
+REDIRECT_URI = settings().redirect_uri
+TOKEN_URI = "https://oauth2.googleapis.com/token"
 SCOPES = [
     "https://www.googleapis.com/auth/calendar.readonly",
     "https://www.googleapis.com/auth/userinfo.email",
@@ -25,14 +24,18 @@ SCOPES = [
 ]
 
 
+@lru_cache(maxsize=1)
 def get_client_config():
-    """Get OAuth client config dict."""
+    """
+    Get OAuth client config dict.
+    Built once and reused; treat the returned dict as read-only.
+    """
     return {
         "web": {
             "client_id": GOOGLE_CLIENT_ID,
             "client_secret": GOOGLE_CLIENT_SECRET,
             "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
+            "token_uri": TOKEN_URI,
             "redirect_uris": [REDIRECT_URI]
         }
     }
@@ -48,7 +51,7 @@ def get_authorization_url(org_id):
     Returns:
         Authorization URL string
     """
-    logger.info(f"[OAUTH] Generating authorization URL for org {org_id}")
+    logger.info("[OAUTH] Generating authorization URL for org %s", org_id)
     
     flow = Flow.from_client_config(
         get_client_config(),
@@ -63,11 +66,33 @@ def get_authorization_url(org_id):
         state=str(org_id)  # Pass org_id through OAuth flow
     )
     
-    logger.info(f"[OAUTH] ✅ Authorization URL generated for org {org_id}")
+    logger.info("[OAUTH] ✅ Authorization URL generated for org %s", org_id)
     return authorization_url
 
 
-def exchange_code_for_tokens(authorization_code):
+def _parse_token_response(payload, refresh_token=None):
+    """
+    Convert a Google token endpoint response into our token dict.
+    
+    Args:
+        payload: JSON body returned by the token endpoint
+        refresh_token: Fallback refresh token (Google omits it on refresh)
+        
+    Returns:
+        Dictionary with access_token, refresh_token, expires_in, expiry
+    """
+    expires_in = payload.get("expires_in")
+    expiry = datetime.now(timezone.utc) + timedelta(seconds=expires_in) if expires_in else None
+    
+    return {
+        "access_token": payload.get("access_token"),
+        "refresh_token": payload.get("refresh_token") or refresh_token,
+        "expires_in": expires_in,
+        "expiry": expiry.isoformat() if expiry else None
+    }
+
+
+async def exchange_code_for_tokens(authorization_code):
     """
     Exchange authorization code for tokens.
     Called when Google redirects back to callback URL.
@@ -78,31 +103,27 @@ def exchange_code_for_tokens(authorization_code):
     Returns:
         Dictionary with access_token, refresh_token, expiry
     """
-    logger.info(f"[OAUTH] Exchanging authorization code for tokens")
+    logger.info("[OAUTH] Exchanging authorization code for tokens")
     
     try:
-        flow = Flow.from_client_config(
-            get_client_config(),
-            scopes=SCOPES,
-            redirect_uri=REDIRECT_URI
-        )
-        
-        flow.fetch_token(code=authorization_code)
-        credentials = flow.credentials
+        response = await GOOGLE_CLIENT.post(TOKEN_URI, data={
+            "grant_type": "authorization_code",
+            "code": authorization_code,
+            "client_id": GOOGLE_CLIENT_ID,
+            "client_secret": GOOGLE_CLIENT_SECRET,
+            "redirect_uri": REDIRECT_URI
+        })
+        response.raise_for_status()
         
-        logger.info(f"[OAUTH] ✅ Successfully exchanged code for tokens")
+        logger.info("[OAUTH] ✅ Successfully exchanged code for tokens")
         
-        return {
-            "access_token": credentials.token,
-            "refresh_token": credentials.refresh_token,
-            "expiry": credentials.expiry.isoformat() if credentials.expiry else None
-        }
+        return _parse_token_response(response.json())
     except Exception as e:
-        logger.error(f"[OAUTH] ❌ Failed to exchange code for tokens: {e}")
+        logger.error("[OAUTH] ❌ Failed to exchange code for tokens: %s", e)
         raise
 
 
-def refresh_access_token(refresh_token):
+async def refresh_access_token(refresh_token):
     """
     Get new access token using refresh token.
     
@@ -112,32 +133,26 @@ def refresh_access_token(refresh_token):
     Returns:
         Dictionary with new access_token, refresh_token, expiry
     """
-    logger.info(f"[OAUTH] Refreshing access token using refresh token")
+    logger.info("[OAUTH] Refreshing access token using refresh token")
     
     try:
-        credentials = Credentials(
-            token=None,
-            refresh_token=refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=GOOGLE_CLIENT_ID,
-            client_secret=GOOGLE_CLIENT_SECRET
-        )
-        
-        credentials.refresh(Request())
+        response = await GOOGLE_CLIENT.post(TOKEN_URI, data={
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token,
+            "client_id": GOOGLE_CLIENT_ID,
+            "client_secret": GOOGLE_CLIENT_SECRET
+        })
+        response.raise_for_status()
         
-        logger.info(f"[OAUTH] ✅ Successfully refreshed access token")
+        logger.info("[OAUTH] ✅ Successfully refreshed access token")
         
-        return {
-            "access_token": credentials.token,
-            "refresh_token": credentials.refresh_token or refresh_token,
-            "expiry": credentials.expiry.isoformat() if credentials.expiry else None
-        }
+        return _parse_token_response(response.json(), refresh_token=refresh_token)
     except Exception as e:
-        logger.error(f"[OAUTH] ❌ Failed to refresh access token: {e}")
+        logger.error("[OAUTH] ❌ Failed to refresh access token: %s", e)
         raise
 
 
-def get_user_info(access_token):
+async def get_user_info(access_token):
     """
     Fetch user info (email) from Google using access token.
     
@@ -147,19 +162,17 @@ def get_user_info(access_token):
     Returns:
         Dictionary with email and other user info
     """
-    import requests
-    
     logger.info("[OAUTH] Fetching user info from Google")
     
     try:
-        response = requests.get(
+        response = await GOOGLE_CLIENT.get(
             "https://www.googleapis.com/oauth2/v2/userinfo",
             headers={"Authorization": f"Bearer {access_token}"}
         )
         response.raise_for_status()
         user_info = response.json()
         
-        logger.info(f"[OAUTH] ✅ Got user info, email={user_info.get('email')}")
+        logger.info("[OAUTH] ✅ Got user info, email=%s", user_info.get('email'))
         
         return {
             "email": user_info.get("email"),
@@ -167,5 +180,5 @@ def get_user_info(access_token):
             "picture": user_info.get("picture")
         }
     except Exception as e:
-        logger.error(f"[OAUTH] ❌ Failed to fetch user info: {e}")
+        logger.error("[OAUTH] ❌ Failed to fetch user info: %s", e)
         return {"email": None, "name": None, "picture": None}
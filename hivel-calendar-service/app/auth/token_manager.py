@@ -3,7 +3,10 @@ Token manager for Google Calendar integration.
 Uses database functions from events.py for storage.
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from cachetools import TTLCache
 from app.auth import oauth
 from app.database.events import (
     get_integration_tokens,
@@ -13,19 +16,62 @@ from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Refresh tokens this long before they actually expire
+EXPIRY_SKEW = timedelta(minutes=5)
 
-def get_tokens(org_id):
+# In-process access token cache: org_id -> (access_token, expires_at)
+# TTL bounds how long we trust a token without re-reading the DB.
+_token_cache = TTLCache(maxsize=10_000, ttl=300)
+_token_cache_lock = threading.Lock()
+
+# One refresh in flight per org; concurrent callers wait on its lock.
+# org_id -> [lock, callers using it]; dropped once the last caller is done
+_refresh_locks = {}
+
+
+def get_cached_token(org_id):
+    """
+    Get access token from in-process cache.
+    
+    Returns:
+        Cached access token, or None if missing or about to expire
+    """
+    with _token_cache_lock:
+        cached = _token_cache.get(org_id)
+    
+    if not cached:
+        return None
+    
+    access_token, expires_at = cached
+    if expires_at and expires_at < datetime.now(timezone.utc) + EXPIRY_SKEW:
+        return None
+    return access_token
+
+
+def cache_token(org_id, access_token, expires_at):
+    """Store access token in in-process cache."""
+    with _token_cache_lock:
+        _token_cache[org_id] = (access_token, expires_at)
+
+
+def invalidate_token(org_id):
+    """Drop cached access token for an org (e.g. on re-auth)."""
+    with _token_cache_lock:
+        _token_cache.pop(org_id, None)
+
+
+async def get_tokens(org_id):
     """Get tokens from database."""
-    logger.debug(f"[TOKEN] Retrieving tokens for org {org_id}")
-    tokens = get_integration_tokens(org_id)
+    logger.debug("[TOKEN] Retrieving tokens for org %s", org_id)
+    tokens = await get_integration_tokens(org_id)
     if tokens:
-        logger.debug(f"[TOKEN] ✅ Tokens found for org {org_id}")
+        logger.debug("[TOKEN] ✅ Tokens found for org %s", org_id)
     else:
-        logger.warning(f"[TOKEN] ⚠️ No tokens found for org {org_id}")
+        logger.warning("[TOKEN] ⚠️ No tokens found for org %s", org_id)
     return tokens
 
 
-def save_tokens(org_id, tokens, email=None):
+async def save_tokens(org_id, tokens, email=None):
     """
     Save tokens to database.
     
@@ -34,23 +80,24 @@ def save_tokens(org_id, tokens, email=None):
         tokens: Dict with access_token, refresh_token, expires_in
         email: User's email (optional)
     """
-    logger.info(f"[TOKEN] Saving tokens for org {org_id}, email={email}")
+    logger.info("[TOKEN] Saving tokens for org %s, email=%s", org_id, email)
     access_token = tokens.get('access_token')
     refresh_token = tokens.get('refresh_token')
-    expires_in = tokens.get('expires_in', 3600)  # Default 1 hour (in seconds)
+    expires_in = tokens.get('expires_in') or 3600  # Default 1 hour (in seconds)
     
-    result = save_integration_tokens(
+    result = await save_integration_tokens(
         org_id=org_id,
         access_token=access_token,
         refresh_token=refresh_token,
         expires_in=expires_in,
         email=email
     )
-    logger.info(f"[TOKEN] ✅ Tokens saved successfully for org {org_id}")
+    cache_token(org_id, access_token, datetime.now(timezone.utc) + timedelta(seconds=expires_in))
+    logger.info("[TOKEN] ✅ Tokens saved successfully for org %s", org_id)
     return result
 
 
-def get_valid_token(org_id):
+async def get_valid_token(org_id):
     """
     Get a valid access token, refreshing if expired.
     
@@ -60,45 +107,78 @@ def get_valid_token(org_id):
     Raises:
         Exception if no tokens found or refresh fails
     """
-    logger.info(f"[TOKEN] Getting valid token for org {org_id}")
+    logger.info("[TOKEN] Getting valid token for org %s", org_id)
+    
+    cached_token = get_cached_token(org_id)
+    if cached_token:
+        logger.debug("[TOKEN] ✅ Using cached token for org %s", org_id)
+        return cached_token
     
-    tokens = get_tokens(org_id)
+    tokens = await get_tokens(org_id)
     
     if not tokens:
-        logger.error(f"[TOKEN] ❌ No tokens found for org {org_id}")
+        logger.error("[TOKEN] ❌ No tokens found for org %s", org_id)
         raise Exception(f"No tokens found for organization {org_id}. Please authenticate first.")
     
-    # Calculate expiry from expires_in + access_token_generation_date
-    expires_in = tokens.get('expires_in', 3600)
-    generation_date = tokens.get('access_token_generation_date')
+    # expires_at is computed by the DB (generation date + expires_in, timezone-aware)
+    expires_at = tokens.get('expires_at')
     
-    is_expired = False
-    if generation_date:
-        expires_at = generation_date + timedelta(seconds=expires_in)
-        # Check if expired or about to expire (within 5 minutes)
-        is_expired = expires_at < datetime.now() + timedelta(minutes=5)
-        logger.debug(f"[TOKEN] Token expires at {expires_at}, is_expired={is_expired}")
+    # Expired or about to expire (within 5 minutes)
+    is_expired = bool(expires_at) and expires_at < datetime.now(timezone.utc) + EXPIRY_SKEW
+    logger.debug("[TOKEN] Token expires at %s, is_expired=%s", expires_at, is_expired)
     
     if is_expired:
-        logger.info(f"[TOKEN] Token expired for org {org_id}, refreshing...")
-        
-        refresh_token = tokens.get('refresh_token')
-        if not refresh_token:
-            logger.error(f"[TOKEN] ❌ No refresh token found for org {org_id}")
-            raise Exception(f"No refresh token found for org {org_id}. Re-authentication required.")
-        
-        # Get new tokens from Google
-        logger.info(f"[TOKEN] Calling Google OAuth to refresh token")
-        new_tokens = oauth.refresh_access_token(refresh_token)
-        logger.info(f"[TOKEN] ✅ Token refreshed successfully")
-        
-        # Save the new tokens (refresh_token might not be returned, keep old one)
-        if not new_tokens.get('refresh_token'):
-            new_tokens['refresh_token'] = refresh_token
-        
-        save_tokens(org_id, new_tokens, email=tokens.get('email'))
-        
-        return new_tokens['access_token']
+        logger.info("[TOKEN] Token expired for org %s, refreshing...", org_id)
+        return await refresh_token_once(org_id, tokens)
     
-    logger.info(f"[TOKEN] ✅ Token is valid for org {org_id}")
+    logger.info("[TOKEN] ✅ Token is valid for org %s", org_id)
+    cache_token(org_id, tokens['token'], expires_at)
     return tokens['token']
+
+
+async def refresh_token_once(org_id, tokens):
+    """
+    Refresh an expired token, at most once per org at a time.
+    Concurrent callers wait for the in-flight refresh and reuse its result.
+    
+    Args:
+        org_id: Organization ID
+        tokens: Token row from get_tokens
+        
+    Returns:
+        Valid access token string
+    """
+    entry = _refresh_locks.get(org_id)
+    if entry is None:
+        entry = _refresh_locks[org_id] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    
+    try:
+        async with entry[0]:
+            # Another task may have refreshed while we waited
+            cached_token = get_cached_token(org_id)
+            if cached_token:
+                logger.debug("[TOKEN] ✅ Token already refreshed for org %s", org_id)
+                return cached_token
+            
+            refresh_token = tokens.get('refresh_token')
+            if not refresh_token:
+                logger.error("[TOKEN] ❌ No refresh token found for org %s", org_id)
+                raise Exception(f"No refresh token found for org {org_id}. Re-authentication required.")
+            
+            # Get new tokens from Google
+            logger.info("[TOKEN] Calling Google OAuth to refresh token")
+            new_tokens = await oauth.refresh_access_token(refresh_token)
+            logger.info("[TOKEN] ✅ Token refreshed successfully")
+            
+            # Save the new tokens (refresh_token might not be returned, keep old one)
+            if not new_tokens.get('refresh_token'):
+                new_tokens['refresh_token'] = refresh_token
+            
+            await save_tokens(org_id, new_tokens, email=tokens.get('email'))
+            
+            return new_tokens['access_token']
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _refresh_locks[org_id]
@@ -3,117 +3,436 @@ Calendar data fetching functions.
 Functional style matching existing Hivel fetch_new_data.py.
 """
 
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from datetime import datetime, timedelta
+import asyncio
+import uuid
+import orjson
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import quote, urlencode
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.core.http import GOOGLE_CLIENT
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+CALENDAR_API_URL = "https://www.googleapis.com/calendar/v3"
+CALENDAR_BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
 
-def build_calendar_service(access_token):
+# Google caps Calendar batch requests at 50 calls
+BATCH_SIZE = 50
+
+# Partial response for the save-only path (/initial-sync): just the fields
+# save_events stores. Paths that return raw events to clients
+# (/calendar/sync, /stream) request full events instead.
+SAVE_EVENT_FIELDS = (
+    "nextPageToken,nextSyncToken,"
+    "items(id,etag,kind,status,summary,description,start,end,"
+    "creator,organizer,attendees,eventType,visibility,recurringEventId)"
+)
+CALENDAR_LIST_FIELDS = "nextPageToken,items(id)"
+
+# Attendee fields kept by parse_event, with their defaults
+ATTENDEE_FIELDS = (
+    ('email', None),
+    ('displayName', None),
+    ('responseStatus', None),
+    ('organizer', False),
+    ('self', False),
+    ('optional', False),
+    ('resource', False),
+    ('comment', None),
+)
+
+# parse_event memo: (id, etag, source_email) -> parsed event, LRU-bounded
+PARSE_CACHE_SIZE = 100_000
+_parsed_events = OrderedDict()
+
+# Max calendars fetched concurrently per sync (GOOGLE_FETCH_CONCURRENCY)
+FETCH_CONCURRENCY = settings().google_fetch_concurrency
+
+# Events per batch handed to the DB layer by iter_event_batches
+SAVE_BATCH_SIZE = 5000
+
+# First-page batch calls in flight (or buffered, waiting for workers)
+# at once, so prefetching never runs more than this many batches of
+# first pages ahead of the FETCH_CONCURRENCY workers
+FIRST_PAGE_BATCHES_AHEAD = 2
+
+
+class SyncTokenExpired(Exception):
+    """Google rejected a syncToken or updatedMin (HTTP 410); a full resync is required."""
+
+
+def _auth_headers(access_token):
+    """Build the Authorization header for Google Calendar REST calls."""
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+def to_rfc3339(value):
     """
-    Build Google Calendar service with access token.
-    
-    Args:
-        access_token: Valid OAuth access token
-        
-    Returns:
-        Google Calendar API service
+    Format a datetime as an RFC3339 UTC timestamp for Google query params.
+    Naive datetimes are taken as UTC; strings are passed through as-is.
     """
-    credentials = Credentials(token=access_token)
-    return build('calendar', 'v3', credentials=credentials)
+    if not isinstance(value, datetime):
+        return value
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def fetch_all_calendar_list(service):
+async def iter_calendar_list(access_token, raise_errors=False):
     """
-    Get list of all calendar IDs accessible to this token.
+    Yield accessible calendar IDs one calendarList page at a time, so
+    callers can start fetching events before the whole list is read.
     For Marketplace app, this returns ONLY calendars for
     users the admin scoped the app to.
     
     Args:
-        service: Google Calendar API service
+        access_token: Valid OAuth access token
+        raise_errors: Re-raise Google/network errors instead of logging
+            them and stopping early (leaving the list short)
         
-    Returns:
-        List of calendar email/IDs
+    Yields:
+        List of calendar email/IDs per page
     """
-    calendar_emails = []
     page_token = None
     
     while True:
         try:
-            calendar_list = service.calendarList().list(
-                pageToken=page_token
-            ).execute()
-            
-            for calendar_entry in calendar_list.get('items', []):
-                calendar_emails.append(calendar_entry['id'])
-            
+            params = {"fields": CALENDAR_LIST_FIELDS}
+            if page_token:
+                params["pageToken"] = page_token
+            response = await GOOGLE_CLIENT.get(
+                f"{CALENDAR_API_URL}/users/me/calendarList",
+                params=params,
+                headers=_auth_headers(access_token)
+            )
+            response.raise_for_status()
+            calendar_list = response.json()
             page_token = calendar_list.get('nextPageToken')
-            if not page_token:
-                break
         except Exception as ex:
-            logger.error(f"Failed to fetch calendars: {ex}")
-            break
+            logger.error("Failed to fetch calendars: %s", ex)
+            if raise_errors:
+                raise
+            return
+        
+        yield [calendar_entry['id'] for calendar_entry in calendar_list.get('items', [])]
+        
+        if not page_token:
+            return
+
+
+async def fetch_all_calendar_list(access_token):
+    """
+    Get list of all calendar IDs accessible to this token.
+    For Marketplace app, this returns ONLY calendars for
+    users the admin scoped the app to.
+    
+    Args:
+        access_token: Valid OAuth access token
+        
+    Returns:
+        List of calendar email/IDs
     
-    return calendar_emails
+    Raises:
+        The underlying error if any calendarList page could not be fetched
+        (so a partial or empty list is never mistaken for the full one)
+    """
+    return [
+        calendar_id
+        async for page in iter_calendar_list(access_token, raise_errors=True)
+        for calendar_id in page
+    ]
+
+
+def _events_params(start_date, end_date, page_token=None, sync_token=None, updated_min=None,
+                   fields=None):
+    """
+    Build the events.list query params.
+    sync_token mode drops time bounds; updated_min keeps them but only
+    returns events modified since then (deletions included).
+    fields, if given, is a partial-response mask (e.g. SAVE_EVENT_FIELDS).
+    """
+    if sync_token:
+        params = {
+            "syncToken": sync_token,
+            "singleEvents": "true",
+            "timeZone": "UTC"
+        }
+    else:
+        params = {
+            "timeMin": start_date,
+            "timeMax": end_date,
+            "orderBy": "startTime",
+            "singleEvents": "true",
+            "timeZone": "UTC"
+        }
+        if updated_min:
+            params["updatedMin"] = to_rfc3339(updated_min)
+            del params["orderBy"]
+    if fields:
+        params["fields"] = fields
+    if page_token:
+        params["pageToken"] = page_token
+    return params
+
+
+def _events_page(events_result):
+    """Reduce an events.list response to items, pageToken and syncToken."""
+    return {
+        "items": events_result.get("items", []),
+        "pageToken": events_result.get("nextPageToken"),
+        "syncToken": events_result.get("nextSyncToken")
+    }
 
 
-def fetch_calendar_events(service, calendar_email, start_date, end_date, page_token=None):
+async def fetch_calendar_events(access_token, calendar_email, start_date, end_date,
+                                page_token=None, sync_token=None, updated_min=None, fields=None):
     """
     Fetch events from a specific calendar.
+    With a sync_token, only events changed since that token are returned
+    (Google disallows time bounds and ordering in that mode).
     
     Args:
-        service: Google Calendar API service
+        access_token: Valid OAuth access token
         calendar_email: Calendar email/ID
         start_date: Start of date range (ISO format string)
         end_date: End of date range (ISO format string)
         page_token: Optional pagination token
+        sync_token: Optional sync token from a previous sync
+        updated_min: Optional last sync time (ignored with a sync_token)
+        fields: Optional partial-response mask (full events if omitted)
+        
+    Returns:
+        Dictionary with items (events), pageToken and syncToken
+        (syncToken is only set on the last page)
+    
+    Raises:
+        SyncTokenExpired if Google invalidated the sync token / updatedMin
+    """
+    response = await GOOGLE_CLIENT.get(
+        f"{CALENDAR_API_URL}/calendars/{quote(calendar_email, safe='')}/events",
+        params=_events_params(start_date, end_date, page_token, sync_token, updated_min, fields),
+        headers=_auth_headers(access_token)
+    )
+    if response.status_code == 410 and (sync_token or updated_min):
+        raise SyncTokenExpired(f"Sync token expired for {calendar_email}")
+    response.raise_for_status()
+    return _events_page(response.json())
+
+
+def _parse_batch_response(content_type, body):
+    """
+    Split a multipart/mixed batch response into {content_id: (status, payload)}.
+    """
+    boundary = content_type.split("boundary=", 1)[1].strip('"').encode()
+    parts = {}
+    for part in body.split(b"--" + boundary):
+        # Each part: MIME headers, blank line, embedded HTTP response
+        if b"\r\n\r\n" not in part:
+            continue
+        mime_headers, http_response = part.split(b"\r\n\r\n", 1)
+        content_id = None
+        for line in mime_headers.split(b"\r\n"):
+            if line.lower().startswith(b"content-id:"):
+                content_id = line.split(b":", 1)[1].strip().decode()
+        head, _, payload = http_response.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        parts[content_id] = (status, payload)
+    return parts
+
+
+async def fetch_first_pages_batch(access_token, calendar_emails, start_date, end_date, sync_tokens,
+                                  updated_mins=None, fields=None):
+    """
+    Fetch the first events page of many calendars via Google's batch endpoint.
+    Coalesces up to BATCH_SIZE events.list calls into one multipart/mixed POST,
+    so N calendars cost ceil(N/50) round-trips instead of N.
+    
+    Args:
+        access_token: Valid OAuth access token
+        calendar_emails: Calendar emails/IDs
+        start_date: Start of date range (ISO format string)
+        end_date: End of date range (ISO format string)
+        sync_tokens: dict of calendar ID -> syncToken
+        updated_mins: Optional dict of calendar ID -> last sync time
+        fields: Optional partial-response mask (full events if omitted)
         
     Returns:
-        Dictionary with items (events) and pageToken
+        Dict of calendar ID -> first page (as fetch_calendar_events returns it),
+        or SyncTokenExpired for calendars whose token/updatedMin Google rejected.
+        Calendars that failed inside the batch are left out so callers
+        fall back to fetching them individually.
     """
-    events_result = service.events().list(
-        calendarId=calendar_email,
-        timeMin=start_date,
-        timeMax=end_date,
-        orderBy="startTime",
-        singleEvents=True,
-        timeZone="UTC",
-        pageToken=page_token
-    ).execute()
+    updated_mins = updated_mins or {}
+    
+    async def fetch_chunk(emails):
+        boundary = f"batch_{uuid.uuid4().hex}"
+        body = []
+        for i, email in enumerate(emails):
+            params = _events_params(
+                start_date, end_date,
+                sync_token=sync_tokens.get(email),
+                updated_min=updated_mins.get(email),
+                fields=fields
+            )
+            body.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item{i}>\r\n\r\n"
+                f"GET /calendar/v3/calendars/{quote(email, safe='')}/events?{urlencode(params)}\r\n\r\n"
+            )
+        body.append(f"--{boundary}--\r\n")
+        
+        try:
+            response = await GOOGLE_CLIENT.post(
+                CALENDAR_BATCH_URL,
+                content="".join(body).encode(),
+                headers={
+                    **_auth_headers(access_token),
+                    "Content-Type": f"multipart/mixed; boundary={boundary}"
+                }
+            )
+            response.raise_for_status()
+            parts = _parse_batch_response(response.headers["content-type"], response.content)
+        except Exception as e:
+            logger.warning("[CALENDAR] ⚠️ Batch request failed, fetching %s calendars individually: %s", len(emails), e)
+            return {}
+        
+        pages = {}
+        for i, email in enumerate(emails):
+            status, payload = parts.get(f"<response-item{i}>", (None, None))
+            if status == 200:
+                pages[email] = _events_page(orjson.loads(payload))
+            elif status == 410 and (sync_tokens.get(email) or updated_mins.get(email)):
+                pages[email] = SyncTokenExpired(f"Sync token expired for {email}")
+        return pages
     
-    events = events_result.get("items", [])
-    next_page_token = events_result.get("nextPageToken")
+    semaphore = asyncio.Semaphore(FIRST_PAGE_BATCHES_AHEAD)
     
-    return {"items": events, "pageToken": next_page_token}
+    async def fetch_chunk_bounded(emails):
+        async with semaphore:
+            return await fetch_chunk(emails)
+    
+    chunks = [calendar_emails[i:i + BATCH_SIZE] for i in range(0, len(calendar_emails), BATCH_SIZE)]
+    first_pages = {}
+    for pages in await asyncio.gather(*(fetch_chunk_bounded(chunk) for chunk in chunks)):
+        first_pages.update(pages)
+    return first_pages
+
+
+@dataclass(slots=True)
+class ParsedEvent:
+    """One Google event in our format (slots keep per-event memory small)."""
+    
+    # Core identifiers
+    google_event_id: Optional[str]
+    kind: Optional[str]
+    etag: Optional[str]
+    status: Optional[str]
+    iCalUID: Optional[str]
+    sequence: Optional[int]
+    
+    # Content
+    title: str
+    description: Optional[str]
+    location: Optional[str]
+    colorId: Optional[str]
+    
+    # Links
+    htmlLink: Optional[str]
+    hangoutLink: Optional[str]
+    
+    # Timestamps
+    created: Optional[str]
+    updated: Optional[str]
+    
+    # Start/End with timezone
+    start_time: Optional[str]
+    start_timezone: Optional[str]
+    end_time: Optional[str]
+    end_timezone: Optional[str]
+    
+    # People
+    creator_email: Optional[str]
+    creator_displayName: Optional[str]
+    creator_self: bool
+    organizer_email: Optional[str]
+    organizer_displayName: Optional[str]
+    organizer_self: bool
+    
+    # Attendees
+    attendees: list
+    
+    # Recurrence
+    recurringEventId: Optional[str]
+    recurrence: Optional[list]
+    originalStartTime: Optional[dict]
+    
+    # Event properties
+    event_type: Optional[str]
+    visibility: Optional[str]
+    transparency: Optional[str]
+    privateCopy: bool
+    locked: bool
+    guestsCanModify: bool
+    guestsCanInviteOthers: bool
+    guestsCanSeeOtherGuests: bool
+    
+    # Conference/Meeting
+    conferenceData: dict
+    conferenceId: Optional[str]
+    
+    # Reminders
+    reminders: Optional[dict]
+    
+    # Attachments
+    attachments: Optional[list]
+    
+    # Source calendar
+    source_email: str
 
 
 def parse_event(event, source_email):
     """
     Parse raw Google event into our format.
     Captures ALL fields from the Google Calendar API.
+    Google changes an event's etag on every modification, so results are
+    memoized by (id, etag, source_email); unchanged events seen again in
+    overlapping syncs are a dict lookup. Treat the result as read-only.
     
     Args:
         event: Raw event from Google API
         source_email: Calendar email this event came from
         
     Returns:
-        Parsed event dictionary with all fields
+        ParsedEvent with all fields (dataclasses.asdict() for a dict)
     """
+    etag = event.get('etag')
+    if etag is None:
+        return _parse_event(event, source_email)
+    
+    key = (event.get('id'), etag, source_email)
+    parsed = _parsed_events.get(key)
+    if parsed is not None:
+        _parsed_events.move_to_end(key)
+        return parsed
+    
+    parsed = _parsed_events[key] = _parse_event(event, source_email)
+    if len(_parsed_events) > PARSE_CACHE_SIZE:
+        _parsed_events.popitem(last=False)
+    return parsed
+
+
+def _parse_event(event, source_email):
+    """Build the ParsedEvent (uncached, see parse_event)."""
     # Get attendees with full details
-    attendees = []
-    for attendee in event.get('attendees', []):
-        attendees.append({
-            'email': attendee.get('email'),
-            'displayName': attendee.get('displayName'),
-            'responseStatus': attendee.get('responseStatus'),
-            'organizer': attendee.get('organizer', False),
-            'self': attendee.get('self', False),
-            'optional': attendee.get('optional', False),
-            'resource': attendee.get('resource', False),
-            'comment': attendee.get('comment')
-        })
+    attendees = [
+        {key: attendee.get(key, default) for key, default in ATTENDEE_FIELDS}
+        for attendee in event.get('attendees', ())
+    ]
     
     # Get start/end with timezone
     start = event.get('start', {})
@@ -126,145 +445,331 @@ def parse_event(event, source_email):
     # Get conference data
     conference_data = event.get('conferenceData', {})
     
-    return {
+    return ParsedEvent(
         # Core identifiers
-        'google_event_id': event.get('id'),
-        'kind': event.get('kind'),
-        'etag': event.get('etag'),
-        'status': event.get('status'),
-        'iCalUID': event.get('iCalUID'),
-        'sequence': event.get('sequence'),
+        google_event_id=event.get('id'),
+        kind=event.get('kind'),
+        etag=event.get('etag'),
+        status=event.get('status'),
+        iCalUID=event.get('iCalUID'),
+        sequence=event.get('sequence'),
         
         # Content
-        'title': event.get('summary', 'No Title'),
-        'description': event.get('description'),
-        'location': event.get('location'),
-        'colorId': event.get('colorId'),
+        title=event.get('summary', 'No Title'),
+        description=event.get('description'),
+        location=event.get('location'),
+        colorId=event.get('colorId'),
         
         # Links
-        'htmlLink': event.get('htmlLink'),
-        'hangoutLink': event.get('hangoutLink'),
+        htmlLink=event.get('htmlLink'),
+        hangoutLink=event.get('hangoutLink'),
         
         # Timestamps
-        'created': event.get('created'),
-        'updated': event.get('updated'),
+        created=event.get('created'),
+        updated=event.get('updated'),
         
         # Start/End with timezone
-        'start_time': start.get('dateTime') or start.get('date'),
-        'start_timezone': start.get('timeZone'),
-        'end_time': end.get('dateTime') or end.get('date'),
-        'end_timezone': end.get('timeZone'),
+        start_time=start.get('dateTime') or start.get('date'),
+        start_timezone=start.get('timeZone'),
+        end_time=end.get('dateTime') or end.get('date'),
+        end_timezone=end.get('timeZone'),
         
         # People
-        'creator_email': creator.get('email'),
-        'creator_displayName': creator.get('displayName'),
-        'creator_self': creator.get('self', False),
-        'organizer_email': organizer.get('email'),
-        'organizer_displayName': organizer.get('displayName'),
-        'organizer_self': organizer.get('self', False),
+        creator_email=creator.get('email'),
+        creator_displayName=creator.get('displayName'),
+        creator_self=creator.get('self', False),
+        organizer_email=organizer.get('email'),
+        organizer_displayName=organizer.get('displayName'),
+        organizer_self=organizer.get('self', False),
         
         # Attendees
-        'attendees': attendees,
+        attendees=attendees,
         
         # Recurrence
-        'recurringEventId': event.get('recurringEventId'),
-        'recurrence': event.get('recurrence'),
-        'originalStartTime': event.get('originalStartTime'),
+        recurringEventId=event.get('recurringEventId'),
+        recurrence=event.get('recurrence'),
+        originalStartTime=event.get('originalStartTime'),
         
         # Event properties
-        'event_type': event.get('eventType'),
-        'visibility': event.get('visibility'),
-        'transparency': event.get('transparency'),
-        'privateCopy': event.get('privateCopy', False),
-        'locked': event.get('locked', False),
-        'guestsCanModify': event.get('guestsCanModify', False),
-        'guestsCanInviteOthers': event.get('guestsCanInviteOthers', True),
-        'guestsCanSeeOtherGuests': event.get('guestsCanSeeOtherGuests', True),
+        event_type=event.get('eventType'),
+        visibility=event.get('visibility'),
+        transparency=event.get('transparency'),
+        privateCopy=event.get('privateCopy', False),
+        locked=event.get('locked', False),
+        guestsCanModify=event.get('guestsCanModify', False),
+        guestsCanInviteOthers=event.get('guestsCanInviteOthers', True),
+        guestsCanSeeOtherGuests=event.get('guestsCanSeeOtherGuests', True),
         
         # Conference/Meeting
-        'conferenceData': conference_data,
-        'conferenceId': conference_data.get('conferenceId') if conference_data else None,
+        conferenceData=conference_data,
+        conferenceId=conference_data.get('conferenceId') if conference_data else None,
         
         # Reminders
-        'reminders': event.get('reminders'),
+        reminders=event.get('reminders'),
         
         # Attachments
-        'attachments': event.get('attachments'),
+        attachments=event.get('attachments'),
         
         # Source calendar
-        'source_email': source_email
-    }
+        source_email=source_email
+    )
 
 
-def fetch_data(org_id, access_token, start_date, end_date):
+async def iter_calendar_pages(org_id, access_token, email, start_date, end_date, sync_tokens,
+                              first_page=None, updated_min=None, completed=None, fields=None):
     """
-    Fetch all calendar data for an organization.
-    Main entry point for calendar sync.
+    Yield events from one calendar, one Google page at a time.
+    Pages are fetched sequentially (each needs the previous pageToken).
     
     Args:
         org_id: Organization ID
         access_token: Valid OAuth access token
+        email: Calendar email/ID
         start_date: Start date (ISO format string)
         end_date: End date (ISO format string)
+        sync_tokens: dict of calendar ID -> syncToken (updated in place)
+        first_page: Optional first page already fetched by fetch_first_pages_batch
+        updated_min: Optional last sync time, used when there is no sync token
+        completed: Optional set; email is added once the last page was
+            fetched (not when fetching stopped on an error)
+        fields: Optional partial-response mask (full events if omitted)
         
-    Returns:
-        List of all parsed events
+    Yields:
+        List of raw events per page
     """
-    logger.info(f"[CALENDAR] Starting calendar fetch for org {org_id}")
-    logger.info(f"[CALENDAR] Date range: {start_date} to {end_date}")
+    logger.info("[CALENDAR] Fetching events from: %s", email)
+    calendar_event_count = 0
+    done = False
+    page_token = None
+    sync_token = sync_tokens.get(email)
     
-    # Build service
-    logger.info(f"[CALENDAR] Building Google Calendar service")
-    service = build_calendar_service(access_token)
+    while not done:
+        try:
+            if first_page is not None:
+                result, first_page = first_page, None
+                if isinstance(result, Exception):
+                    raise result
+            else:
+                result = await fetch_calendar_events(
+                    access_token, email, start_date, end_date, page_token, sync_token, updated_min,
+                    fields
+                )
+            events = result.get("items", [])
+            page_token = result.get("pageToken")
+            
+            # Use the raw Google event objects and just annotate them
+            # with minimal extra context. Each response is freshly
+            # decoded and not reused, so annotate in place (no copy).
+            for event in events:
+                event["source_email"] = email
+                event["org_id"] = org_id
+            calendar_event_count += len(events)
+            
+            if page_token is None:
+                if result.get("syncToken"):
+                    sync_tokens[email] = result["syncToken"]
+                if completed is not None:
+                    completed.add(email)
+                done = True
+            
+            yield events
+                
+        except SyncTokenExpired:
+            if calendar_event_count:
+                # Pages were already yielded; restarting would yield them
+                # again. Stop here (not completed, so its sync state isn't
+                # advanced) and the next run gets the 410 on page one.
+                logger.warning(
+                    "[CALENDAR] ⚠️ Sync token expired mid-sync for %s, full sync on next run", email
+                )
+                done = True
+                continue
+            logger.warning("[CALENDAR] ⚠️ Sync token expired for %s, doing full sync", email)
+            sync_tokens.pop(email, None)
+            sync_token = None
+            updated_min = None
+            page_token = None
+            
+        except Exception as e:
+            logger.error("[CALENDAR] ❌ Error fetching from %s: %s", email, e)
+            done = True
     
-    # Get all accessible calendars
-    logger.info(f"[CALENDAR] Fetching accessible calendar list")
-    user_emails = fetch_all_calendar_list(service)
-    logger.info(f"[CALENDAR] Found {len(user_emails)} accessible calendars")
+    logger.info("[CALENDAR] ✅ Fetched %s events from %s", calendar_event_count, email)
+
+
+async def iter_events(org_id, access_token, start_date, end_date, sync_tokens=None,
+                      updated_mins=None, completed=None, fields=None):
+    """
+    Async generator over all calendar events for an organization.
+    Calendars are fetched concurrently and events are yielded as each
+    Google page arrives, so the full result set is never held in memory.
+    Bounded queues apply backpressure when the consumer is slow: at most
+    FIRST_PAGE_BATCHES_AHEAD batches of first pages are prefetched ahead
+    of the workers, plus FETCH_CONCURRENCY * 2 pages waiting for the consumer.
     
-    if not user_emails:
-        logger.warning(f"[CALENDAR] ⚠️ No calendars found for org {org_id}")
-        return []
+    Args:
+        org_id: Organization ID
+        access_token: Valid OAuth access token
+        start_date: Start date (datetime or RFC3339 string)
+        end_date: End date (datetime or RFC3339 string)
+        sync_tokens: Optional dict of calendar ID -> syncToken (see fetch_data)
+        updated_mins: Optional dict of calendar ID -> last sync time (see fetch_data)
+        completed: Optional set, filled with calendars fetched to the last page
+        fields: Optional partial-response mask (full events if omitted)
+        
+    Yields:
+        Raw Google event dicts
+    """
+    start_date, end_date = to_rfc3339(start_date), to_rfc3339(end_date)
+    logger.info("[CALENDAR] Starting calendar stream for org %s", org_id)
+    
+    if sync_tokens is None:
+        sync_tokens = {}
+    if updated_mins is None:
+        updated_mins = {}
+    
+    # calendarList pages -> (email, first page) -> FETCH_CONCURRENCY workers
+    # -> event pages -> consumer. Event fetches start as soon as the first
+    # calendarList page arrives instead of after the whole list is read.
+    calendars = asyncio.Queue(maxsize=FETCH_CONCURRENCY)
+    queue = asyncio.Queue(maxsize=FETCH_CONCURRENCY * 2)
+    prefetch = asyncio.Semaphore(FIRST_PAGE_BATCHES_AHEAD)
+    calendar_count = 0
+    
+    async def dispatch(emails):
+        # First page of up to BATCH_SIZE calendars in one batch call. The
+        # slot is held until every page is handed to a worker, so fetched
+        # but unconsumed first pages stay bounded.
+        async with prefetch:
+            first_pages = await fetch_first_pages_batch(
+                access_token, emails, start_date, end_date, sync_tokens, updated_mins, fields
+            )
+            for email in emails:
+                await calendars.put((email, first_pages.pop(email, None)))
+    
+    async def list_calendars():
+        nonlocal calendar_count
+        dispatches = []
+        try:
+            async for emails in iter_calendar_list(access_token):
+                calendar_count += len(emails)
+                dispatches.extend(
+                    asyncio.create_task(dispatch(emails[i:i + BATCH_SIZE]))
+                    for i in range(0, len(emails), BATCH_SIZE)
+                )
+            await asyncio.gather(*dispatches)
+        finally:
+            for task in dispatches:
+                task.cancel()
+            await asyncio.gather(*dispatches, return_exceptions=True)
+    
+    async def worker():
+        while True:
+            item = await calendars.get()
+            if item is None:
+                return
+            email, first_page = item
+            async for page in iter_calendar_pages(
+                org_id, access_token, email, start_date, end_date, sync_tokens,
+                first_page, updated_mins.get(email), completed, fields
+            ):
+                await queue.put(page)
+    
+    async def produce():
+        workers = [asyncio.create_task(worker()) for _ in range(FETCH_CONCURRENCY)]
+        try:
+            await list_calendars()
+            # Workers are still draining calendars here, so the sentinels
+            # can't block forever. Never sent on error/cancellation: the
+            # workers are cancelled below instead.
+            for _ in workers:
+                await calendars.put(None)  # Stop the workers
+            await asyncio.gather(*workers)
+        except Exception as e:
+            logger.error("[CALENDAR] ❌ Error streaming events for org %s: %s", org_id, e)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        await queue.put(None)  # End of stream
+    
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            page = await queue.get()
+            if page is None:
+                break
+            for event in page:
+                yield event
+    finally:
+        # Consumer went away (e.g. client disconnected): stop fetching and
+        # wait for the fetch tasks to unwind so none are left behind
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+    
+    logger.info("[CALENDAR] Found %s accessible calendars", calendar_count)
+    if not calendar_count:
+        logger.warning("[CALENDAR] ⚠️ No calendars found for org %s", org_id)
+
+
+async def iter_event_batches(org_id, access_token, start_date, end_date, sync_tokens=None,
+                             updated_mins=None, completed=None, batch_size=None, fields=None):
+    """
+    Group iter_events into lists of up to batch_size events, so callers can
+    flush each batch to Postgres while only one batch is held in memory.
+    
+    Yields:
+        Lists of raw Google event dicts
+    """
+    batch_size = batch_size or SAVE_BATCH_SIZE
+    batch = []
+    async for event in iter_events(
+        org_id, access_token, start_date, end_date, sync_tokens, updated_mins, completed, fields
+    ):
+        batch.append(event)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def fetch_data(org_id, access_token, start_date, end_date, sync_tokens=None,
+                     updated_mins=None, completed=None):
+    """
+    Fetch all calendar data for an organization as one list.
+    Thin wrapper over iter_events for callers that need every event at
+    once (e.g. to return them in a response); prefer iter_events or
+    iter_event_batches for large orgs.
+    
+    Args:
+        org_id: Organization ID
+        access_token: Valid OAuth access token
+        start_date: Start date (datetime or RFC3339 string)
+        end_date: End date (datetime or RFC3339 string)
+        sync_tokens: Optional dict of calendar ID -> syncToken. Calendars with
+            a token are fetched incrementally; the dict is updated in place
+            with each calendar's nextSyncToken.
+        updated_mins: Optional dict of calendar ID -> last sync time. Calendars
+            without a sync token only fetch events updated since then.
+        completed: Optional set, filled with calendars fetched to the last
+            page (only these may have their last sync time advanced).
+        
+    Returns:
+        List of raw Google events
+    """
+    logger.info("[CALENDAR] Date range: %s to %s", start_date, end_date)
     
     # NOTE:
     # We intentionally return the **raw Google event objects** here,
     # instead of our own parsed/normalized structure.
     # This lets downstream consumers (and the DB layer) work directly
     # with the native Google Calendar fields.
-    all_events = []
-    
-    # Fetch events from each calendar
-    for email in user_emails:
-        logger.info(f"[CALENDAR] Fetching events from: {email}")
-        done = False
-        page_token = None
-        calendar_event_count = 0
-        
-        while not done:
-            try:
-                result = fetch_calendar_events(
-                    service, email, start_date, end_date, page_token
-                )
-                events = result.get("items", [])
-                page_token = result.get("pageToken")
-                
-                for event in events:
-                    # Use the raw Google event object and just annotate it
-                    # with minimal extra context.
-                    raw_event = dict(event)
-                    raw_event["source_email"] = email
-                    raw_event["org_id"] = org_id
-                    all_events.append(raw_event)
-                    calendar_event_count += 1
-                
-                if page_token is None:
-                    done = True
-                    
-            except Exception as e:
-                logger.error(f"[CALENDAR] ❌ Error fetching from {email}: {e}")
-                done = True
-        
-        logger.info(f"[CALENDAR] ✅ Fetched {calendar_event_count} events from {email}")
+    all_events = [
+        event async for event in iter_events(
+            org_id, access_token, start_date, end_date, sync_tokens, updated_mins, completed
+        )
+    ]
     
-    logger.info(f"[CALENDAR] ✅ Total events fetched: {len(all_events)}")
+    logger.info("[CALENDAR] ✅ Total events fetched: %s", len(all_events))
     return all_events
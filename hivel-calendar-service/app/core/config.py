@@ -0,0 +1,57 @@
+"""
+Application settings, loaded once from the environment / .env file.
+
+Usage:
+    from app.core.config import settings
+
+    settings().google_client_id
+"""
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Environment-driven configuration (env var names are case-insensitive)."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # Google OAuth
+    google_client_id: Optional[str] = None
+    google_client_secret: Optional[str] = None
+    redirect_uri: str = "http://localhost:8000/auth/callback"
+
+    # Google Calendar sync
+    google_fetch_concurrency: int = 10  # calendars fetched in parallel per sync
+
+    # Frontend
+    frontend_success_url: str = "http://localhost:3000"
+
+    # Database
+    postgres_dbname: Optional[str] = None
+    postgres_username: Optional[str] = None
+    postgres_password: Optional[str] = None
+    postgres_host: Optional[str] = None
+    db_pool_min_size: int = 4
+    db_pool_max_size: int = 32
+    db_save_concurrency: int = 4  # event chunks written in parallel per save
+    # Server-side prepare a statement after this many executions per
+    # connection (0 = on first use; empty or "none" = never, e.g. behind
+    # pgbouncer in transaction mode)
+    db_prepare_threshold: Optional[int] = 0
+
+    @field_validator("db_prepare_threshold", mode="before")
+    @classmethod
+    def _blank_is_none(cls, value):
+        """DB_PREPARE_THRESHOLD= / none disables prepared statements."""
+        if isinstance(value, str) and value.strip().lower() in ("", "none"):
+            return None
+        return value
+
+
+@lru_cache
+def settings() -> Settings:
+    """Get the process-wide settings (parsed on first call)."""
+    return Settings()
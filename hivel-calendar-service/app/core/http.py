@@ -0,0 +1,30 @@
+"""
+Shared HTTP client for Google APIs.
+One long-lived HTTP/2 client so OAuth, userinfo and Calendar calls
+reuse pooled connections instead of paying a TLS handshake per call.
+
+Usage:
+    from app.core.http import GOOGLE_CLIENT
+
+    response = await GOOGLE_CLIENT.get(url, headers=...)
+"""
+import httpx
+
+
+GOOGLE_CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    # httpx already sends Accept-Encoding: gzip; Google only compresses
+    # API responses when the User-Agent also contains "gzip"
+    headers={"User-Agent": "hivel-calendar-service (gzip)"},
+    limits=httpx.Limits(
+        max_keepalive_connections=50,
+        max_connections=200,
+        keepalive_expiry=60.0  # keep idle Google connections warm between syncs
+    )
+)
+
+
+async def close_client() -> None:
+    """Close the shared client (call once at app shutdown)."""
+    await GOOGLE_CLIENT.aclose()
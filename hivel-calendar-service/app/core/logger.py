@@ -15,12 +15,26 @@ Usage:
     logger.error("This is an error")
     logger.debug("This is a debug message")
 """
+import atexit
+import copy
 import json
 import logging
 import platform
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NAIVE_UTC).decode()
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=str)
+
 
 class JSONFormatter(logging.Formatter):
     """Format logs as JSON for better parsing and monitoring."""
@@ -45,7 +59,7 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "org_id"):
             log_data["org_id"] = record.org_id
 
-        return json.dumps(log_data)
+        return _dumps(log_data)
 
 
 class ConsoleFormatter(logging.Formatter):
@@ -60,13 +74,32 @@ class ConsoleFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Colored level names, built once instead of per record
+        self._level_prefixes = {
+            level: f"{color}{level}{self.RESET}" for level, color in self.COLORS.items()
+        }
+        self._cached_time = (None, "")  # (epoch second, formatted time)
+
+    def formatTime(self, record, datefmt=None):
+        """Default timestamps only change once a second; reuse the formatted part."""
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, cached = self._cached_time
+        if second != cached_second:
+            cached = time.strftime(self.default_time_format, self.converter(second))
+            self._cached_time = (second, cached)
+        return self.default_msec_format % (cached, record.msecs)
+
     def format(self, record):
-        color = self.COLORS.get(record.levelname, self.RESET)
+        level = self._level_prefixes.get(record.levelname, record.levelname)
         
         # Format: timestamp - level - logger - message
         formatted = (
             f"{self.formatTime(record, self.datefmt)} - "
-            f"{color}{record.levelname}{self.RESET} - "
+            f"{level} - "
             f"{record.name} - "
             f"{record.getMessage()}"
         )
@@ -77,15 +110,55 @@ class ConsoleFormatter(logging.Formatter):
         return formatted
 
 
+class _InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process queue: only merges the message args,
+    leaving formatting (timestamps, tracebacks) to the listener thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Background thread writing queued records to stdout (see setup_logging)
+_listener: Optional[QueueListener] = None
+
+# (level, json_format) of the current configuration, None until configured
+_configured: Optional[tuple] = None
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 def setup_logging(level: int = logging.INFO, json_format: bool = False) -> None:
     """
     Configure logging for the application.
+    Log calls only enqueue the record; a QueueListener thread formats it
+    and writes to stdout, so the event loop never blocks on the write.
+    Idempotent: calling it again with the same arguments is a no-op, so
+    repeated imports/initialization never stack handlers.
 
     Args:
         level: Logging level (default: INFO)
         json_format: If True, use JSON formatter (for production). 
                     If False, use human-readable format (for development).
     """
+    global _configured
+    if _configured == (level, json_format):
+        return
+    _configured = (level, json_format)
+    
     # Get the root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
@@ -106,7 +179,13 @@ def setup_logging(level: int = logging.INFO, json_format: bool = False) -> None:
         )
     
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    
+    _stop_listener()
+    log_queue = queue.SimpleQueue()
+    global _listener
+    _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+    root_logger.addHandler(_InProcessQueueHandler(log_queue))
     
     # Reduce noise from third-party libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -137,11 +216,18 @@ class LoggerAdapter(logging.LoggerAdapter):
         base_logger = get_logger(__name__)
         logger = LoggerAdapter(base_logger, {"org_id": 261004})
         logger.info("Processing...")  # Will include org_id in context
+    
+    The context prefix is built once from `extra` at construction; create a
+    new adapter rather than mutating `extra` to change the context.
     """
+    def __init__(self, logger, extra=None):
+        super().__init__(logger, extra or {})
+        context = " ".join(f"{k}={v}" for k, v in self.extra.items())
+        self._prefix = f"[{context}] "
+
     def process(self, msg, kwargs):
         # Add extra context to the message
-        context = " ".join([f"{k}={v}" for k, v in self.extra.items()])
-        return f"[{context}] {msg}", kwargs
+        return self._prefix + str(msg), kwargs
 
 
 # Default logger instance for convenience
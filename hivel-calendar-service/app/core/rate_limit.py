@@ -0,0 +1,63 @@
+"""
+Rate limiting for endpoints that hit Google OAuth or trigger syncs.
+Uses SlowAPI with in-memory storage (limits are per process).
+
+Usage:
+    from app.core.rate_limit import limiter, check_org_limit, INITIAL_SYNC_LIMIT
+
+    @router.get("/auth/start")
+    @limiter.limit("10/minute")
+    async def start_oauth(request: Request, ...):
+        ...
+
+    check_org_limit(INITIAL_SYNC_LIMIT, "initial-sync", org_id)
+"""
+import time
+
+from fastapi import HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from limits import parse
+from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+
+# Per-IP limits applied via @limiter.limit(...)
+limiter = Limiter(key_func=get_remote_address)
+
+# Per-org limit for /initial-sync (org_id is in the JSON body, so it is
+# checked inside the handler rather than by a key_func)
+INITIAL_SYNC_LIMIT = parse("100/hour")
+
+
+def check_org_limit(limit_item, scope: str, org_id) -> None:
+    """
+    Count one hit against a per-org limit.
+
+    Args:
+        limit_item: Parsed limit (e.g. INITIAL_SYNC_LIMIT)
+        scope: Name of the limited operation
+        org_id: Organization ID
+
+    Raises:
+        HTTPException 429 with Retry-After if the org is over the limit
+    """
+    if limiter.limiter.hit(limit_item, scope, str(org_id)):
+        return
+
+    reset_at, _ = limiter.limiter.get_window_stats(limit_item, scope, str(org_id))
+    retry_after = max(int(reset_at - time.time()), 1)
+    raise HTTPException(
+        status_code=429,
+        detail=f"Rate limit exceeded: {limit_item}",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> ORJSONResponse:
+    """Return 429 with a Retry-After header (upper bound: the limit window)."""
+    return ORJSONResponse(
+        {"detail": f"Rate limit exceeded: {exc.detail}"},
+        status_code=429,
+        headers={"Retry-After": str(exc.limit.limit.get_expiry())}
+    )
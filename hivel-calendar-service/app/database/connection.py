@@ -1,48 +1,72 @@
 """
 Database connection module.
-Uses psycopg3 to connect to PostgreSQL.
+Uses a psycopg3 async connection pool to connect to PostgreSQL.
+Pooled connections prepare statements server-side (keyed on the SQL text),
+so the fixed query constants in app.database.events are parsed and
+planned once per connection rather than on every execute.
 """
 
-import os
-import psycopg
-from dotenv import load_dotenv
-
-load_dotenv()
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+from app.core.config import settings
 
 # Database config
-POSTGRES_DBNAME = os.getenv("POSTGRES_DBNAME")
-POSTGRES_USERNAME = os.getenv("POSTGRES_USERNAME")
-POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-POSTGRES_HOST = os.getenv("POSTGRES_HOST")
+POSTGRES_DBNAME = settings().postgres_dbname
+POSTGRES_USERNAME = settings().postgres_username
+POSTGRES_PASSWORD = settings().postgres_password
+POSTGRES_HOST = settings().postgres_host
+
+CONNINFO = make_conninfo(
+    dbname=POSTGRES_DBNAME,
+    user=POSTGRES_USERNAME,
+    password=POSTGRES_PASSWORD,
+    host=POSTGRES_HOST,
+    port=5432
+)
+
+# Shared pool, opened/closed with the app (see app.main)
+POOL = AsyncConnectionPool(
+    conninfo=CONNINFO,
+    min_size=settings().db_pool_min_size,
+    max_size=settings().db_pool_max_size,
+    kwargs={"prepare_threshold": settings().db_prepare_threshold},
+    open=False
+)
+
+
+async def open_pool():
+    """
+    Open the connection pool (call once at app startup).
+    Waits until min_size connections are established, so the first
+    requests (e.g. token lookups) don't pay for connecting.
+    """
+    await POOL.open(wait=True)
+
+
+async def close_pool():
+    """Close the connection pool (call once at app shutdown)."""
+    await POOL.close()
 
 
 def get_connection():
     """
-    Get a PostgreSQL connection.
-    Uses psycopg3 (different from psycopg2).
-    
+    Borrow a PostgreSQL connection from the pool.
+
+    Usage:
+        async with get_connection() as conn:
+            ...
+
     Returns:
-        psycopg connection object
+        Async context manager yielding a psycopg AsyncConnection
     """
-    try:
-        conn = psycopg.connect(
-            dbname=POSTGRES_DBNAME,
-            user=POSTGRES_USERNAME,
-            password=POSTGRES_PASSWORD,
-            host=POSTGRES_HOST,
-            port=5432
-        )
-        return conn
-    except psycopg.Error as e:
-        print(f"Could not connect to PostgreSQL: {e}")
-        raise
-
-
-def test_connection():
+    return POOL.connection()
+
+
+async def test_connection():
     """Test if database connection is working."""
     try:
-        conn = get_connection()
-        conn.close()
+        async with get_connection() as conn:
+            await conn.execute("SELECT 1")
         return True
     except Exception:
         return False
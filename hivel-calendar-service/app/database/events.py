@@ -4,11 +4,20 @@ Saves events to:
   - insightly_meeting.gcalendar (raw event data)
   - insightly.author (user lookup table)
   - insightly_meeting.gcal_event (normalized event data with author IDs)
-Uses SELECT → INSERT/UPDATE pattern.
+  - insightly_meeting.gcal_sync_token (per-calendar incremental sync tokens)
+  - insightly_meeting.gcal_sync_run (per-calendar last complete run, the updatedMin fallback)
+Writes are single-statement INSERT ... ON CONFLICT upserts.
+Deleted-event stubs from incremental syncs only mark the stored event cancelled.
 """
 
-import json
+import asyncio
+import hashlib
+import orjson
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
+from app.core.config import settings
 from app.database.connection import get_connection
 from app.core.logger import get_logger
 
@@ -16,422 +25,847 @@ logger = get_logger(__name__)
 
 SCM_PROVIDER = 'googlecalendar'
 
+# save_events writes events in chunks of SAVE_CHUNK_SIZE, up to
+# SAVE_CONCURRENCY chunks at once (each on its own pooled connection)
+SAVE_CHUNK_SIZE = 500
+SAVE_CONCURRENCY = settings().db_save_concurrency
 
-def get_user(email, org_id, conn):
+# Saves of more than COPY_THRESHOLD events write chunks via COPY + staging
+# tables instead of per-row upserts
+COPY_THRESHOLD = 500
+
+# Author id memo: (_email_key(email), org_id) -> author id, LRU-bounded.
+# Organizers and regular attendees recur across events, so most
+# lookups in save_events never reach the database.
+AUTHOR_CACHE_SIZE = 50_000
+_author_cache = OrderedDict()
+
+
+def _email_key(email):
+    """
+    UTF-8 email with only ASCII A-Z lowercased (bytes.lower). Unlike
+    str.lower() or Postgres lower(), this doesn't depend on the locale,
+    so the app and migrations/004 (translate over A-Z) agree on it.
+    """
+    return email.encode().lower()
+
+
+def _cached_author(email, org_id):
+    """Get a cached author id (or None), marking it recently used."""
+    key = (_email_key(email), org_id)
+    author_id = _author_cache.get(key)
+    if author_id is not None:
+        _author_cache.move_to_end(key)
+    return author_id
+
+
+def _cache_author(email, org_id, author_id):
+    """Remember an author id, evicting the least recently used entry."""
+    _author_cache[(_email_key(email), org_id)] = author_id
+    if len(_author_cache) > AUTHOR_CACHE_SIZE:
+        _author_cache.popitem(last=False)
+
+
+def invalidate_author_cache(org_id=None):
+    """
+    Drop cached author ids for one org (or all orgs if org_id is None).
+    Call when authors may have been removed/merged outside this service.
+    """
+    if org_id is None:
+        _author_cache.clear()
+        return
+    for key in [key for key in _author_cache if key[1] == org_id]:
+        del _author_cache[key]
+
+
+def email_hash(email):
     """
-    Look up an existing author by email.
+    Deterministic author lookup key: sha256 of _email_key(email).
+    Must match insightly.author_email_hash() in
+    migrations/004_author_email_hash.sql.
+    """
+    return hashlib.sha256(_email_key(email)).digest()
+
+
+# Authors are matched through the indexed email hash (no aes_decrypt
+# over every row); the email itself is stored encrypted.
+AUTHOR_BATCH_UPSERT_QUERY = """
+    INSERT INTO insightly.author (
+        email, email_hash, scmprovider, organizationid,
+        type, active, archived, createddate, modifieddate
+    )
+    SELECT aes_encrypt(a.email), a.email_hash, %(scmprovider)s, %(organizationid)s,
+           'USER', true, false, NOW(), NOW()
+    FROM unnest(%(emails)s::text[], %(hashes)s::bytea[]) AS a(email, email_hash)
+    ON CONFLICT (email_hash, scmprovider, organizationid)
+    DO UPDATE SET modifieddate = NOW()
+    RETURNING id, email_hash
+"""
+
+
+async def upsert_authors(emails, org_id, conn):
+    """
+    Get or create authors for many emails in one round-trip.
+    Emails already in the author cache are resolved without a query; the
+    rest go through a single INSERT ... SELECT FROM unnest(...) ON CONFLICT
+    on (email_hash, scmprovider, organizationid), which returns the id of
+    every author, new or existing. The caller commits.
     
     Args:
-        email: User's email address
+        emails: Iterable of email addresses (duplicates and falsy entries are ignored)
         org_id: Organization ID
         conn: Database connection
         
     Returns:
-        id of existing author, or None if not found
+        dict of email -> author id
     """
-    if not email:
-        return None
-        
+    author_ids = {}
+    missing = []
+    for email in dict.fromkeys(emails):  # distinct, in order
+        if not email:
+            continue
+        cached_id = _cached_author(email, org_id)
+        if cached_id:
+            author_ids[email] = cached_id
+        else:
+            missing.append(email)
+    
+    # One row per distinct hash (ON CONFLICT can't touch a row twice);
+    # sorted so concurrent upserts lock rows in the same order
+    by_hash = {email_hash(email): email for email in missing}
+    if not by_hash:
+        return author_ids
+    hashes = sorted(by_hash)
+    
     cursor = None
     
     try:
         cursor = conn.cursor()
         
-        # Check if author exists by decrypting stored email and comparing
-        check_query = """
-            SELECT id FROM insightly.author 
-            WHERE aes_decrypt(email) = %(email)s 
-              AND scmprovider = %(scmprovider)s 
-              AND organizationid = %(organizationid)s
-            LIMIT 1
-        """
-        
-        params = {
-            'email': email,
+        await cursor.execute(AUTHOR_BATCH_UPSERT_QUERY, {
+            'emails': [by_hash[h] for h in hashes],
+            'hashes': hashes,
             'scmprovider': SCM_PROVIDER,
             'organizationid': org_id
-        }
-        
-        cursor.execute(check_query, params)
-        existing = cursor.fetchone()
+        })
+        rows = await cursor.fetchall()
         
-        if existing:
-            return existing[0]
-        return None
+        ids = {bytes(hashed): author_id for author_id, hashed in rows}
+        # Every case variant of an email maps to the same author
+        for email in missing:
+            author_ids[email] = ids[email_hash(email)]
+            _cache_author(email, org_id, author_ids[email])
+        return author_ids
         
     except Exception as e:
-        logger.error(f"Error looking up author {email}: {e}")
+        logger.error("Error upserting %s authors: %s", len(by_hash), e)
         raise
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
 
 
-def insert_user(email, org_id, conn):
+# gcalendar upsert (insert_gcalendar_batch).
+# The WHERE on DO UPDATE skips rows whose fields are unchanged, so
+# re-syncing unchanged events writes no new row versions/WAL (JSON
+# columns are compared as text, which works for json and jsonb).
+# source_email is kept from the first insert: the same event arrives once
+# per attendee calendar, so overwriting it would flip on every sync.
+GCALENDAR_UPSERT_QUERY = """
+    INSERT INTO insightly_meeting.gcalendar (
+        id, kind, status, summary,
+        creator_email, organizer_email,
+        start_date_time, start_timezone,
+        end_date_time, end_timezone,
+        recurringeventid, eventtype,
+        attendees, organizationid, source_email,
+        visibility, processing_status,
+        createddate, modifieddate
+    ) VALUES (
+        %(id)s, %(kind)s, %(status)s, %(summary)s,
+        %(creator_email)s, %(organizer_email)s,
+        %(start_date_time)s, %(start_timezone)s,
+        %(end_date_time)s, %(end_timezone)s,
+        %(recurringeventid)s, %(eventtype)s,
+        %(attendees)s, %(organizationid)s, %(source_email)s,
+        %(visibility)s, %(processing_status)s,
+        NOW(), NOW()
+    )
+    ON CONFLICT (id, organizationid) DO UPDATE SET
+        status = EXCLUDED.status,
+        summary = EXCLUDED.summary,
+        creator_email = EXCLUDED.creator_email,
+        organizer_email = EXCLUDED.organizer_email,
+        start_date_time = EXCLUDED.start_date_time,
+        end_date_time = EXCLUDED.end_date_time,
+        attendees = EXCLUDED.attendees,
+        modifieddate = NOW()
+    WHERE (
+        gcalendar.status, gcalendar.summary,
+        gcalendar.creator_email, gcalendar.organizer_email,
+        gcalendar.start_date_time, gcalendar.end_date_time,
+        gcalendar.attendees::text
+    ) IS DISTINCT FROM (
+        EXCLUDED.status, EXCLUDED.summary,
+        EXCLUDED.creator_email, EXCLUDED.organizer_email,
+        EXCLUDED.start_date_time, EXCLUDED.end_date_time,
+        EXCLUDED.attendees::text
+    )
+"""
+
+
+async def insert_gcalendar_batch(rows, conn):
     """
-    Get existing user or insert a new one.
+    Upsert many events into insightly_meeting.gcalendar at once.
+    One INSERT ... ON CONFLICT (id, organizationid) DO UPDATE per row,
+    sent with executemany (pipelined by psycopg). The caller commits.
     
     Args:
-        email: User's email address
-        org_id: Organization ID
+        rows: List of GCALENDAR_UPSERT_QUERY param dicts,
+            unique on id (save_events dedups them)
         conn: Database connection
         
     Returns:
-        id of author (existing or newly created)
+        Count of events written
     """
-    if not email:
-        return None
+    if not rows:
+        return 0
     
-    # First check if user already exists
-    existing_id = get_user(email, org_id, conn)
-    if existing_id:
-        return existing_id
-        
-    # User doesn't exist, insert new one
     cursor = None
     
     try:
         cursor = conn.cursor()
-        
-        # Insert query - encrypt email before storing
-        insert_query = """
-            INSERT INTO insightly.author (
-                email, scmprovider, organizationid,
-                type, active, archived, createddate, modifieddate
-            ) VALUES (
-                aes_encrypt(%(email)s), %(scmprovider)s, %(organizationid)s,
-                'USER', true, false, NOW(), NOW()
-            )
-            RETURNING id
-        """
-        
-        params = {
-            'email': email,
-            'scmprovider': SCM_PROVIDER,
-            'organizationid': org_id
-        }
-        
-        cursor.execute(insert_query, params)
-        author_id = cursor.fetchone()[0]
-        
-        conn.commit()
-        return author_id
+        await cursor.executemany(GCALENDAR_UPSERT_QUERY, rows)
+        return len(rows)
         
     except Exception as e:
-        logger.error(f"Error inserting author {email}: {e}")
-        conn.rollback()
+        logger.error("Error batch upserting %s gcalendar rows: %s", len(rows), e)
         raise
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
 
 
-def insert_gcalendar(event_data, conn):
+# gcal_event upsert (insert_gcal_event_batch)
+GCAL_EVENT_UPSERT_QUERY = """
+    INSERT INTO insightly_meeting.gcal_event (
+        meeting_identifier, title, description,
+        created_by, start_date_time, end_date_time,
+        attendees, accepted_by, meeting_type,
+        created_on, updated_on, organizationid,
+        attendees_data
+    ) VALUES (
+        %(meeting_identifier)s, %(title)s, %(description)s,
+        %(created_by)s, %(start_date_time)s, %(end_date_time)s,
+        %(attendees)s, %(accepted_by)s, %(meeting_type)s,
+        NOW(), NOW(), %(organizationid)s,
+        %(attendees_data)s
+    )
+    ON CONFLICT (meeting_identifier, organizationid) DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        start_date_time = EXCLUDED.start_date_time,
+        end_date_time = EXCLUDED.end_date_time,
+        attendees = EXCLUDED.attendees,
+        accepted_by = EXCLUDED.accepted_by,
+        attendees_data = EXCLUDED.attendees_data,
+        updated_on = NOW()
+    WHERE (
+        gcal_event.title, gcal_event.description,
+        gcal_event.start_date_time, gcal_event.end_date_time,
+        gcal_event.attendees, gcal_event.accepted_by,
+        gcal_event.attendees_data::text
+    ) IS DISTINCT FROM (
+        EXCLUDED.title, EXCLUDED.description,
+        EXCLUDED.start_date_time, EXCLUDED.end_date_time,
+        EXCLUDED.attendees, EXCLUDED.accepted_by,
+        EXCLUDED.attendees_data::text
+    )
+"""
+
+
+async def insert_gcal_event_batch(rows, conn):
     """
-    Insert or update a calendar event in insightly_meeting.gcalendar.
+    Upsert many events into insightly_meeting.gcal_event at once.
+    Same approach as insert_gcalendar_batch, keyed on
+    (meeting_identifier, organizationid). The caller commits.
     
     Args:
-        event_data: Dictionary with event fields
+        rows: List of GCAL_EVENT_UPSERT_QUERY param dicts,
+            unique on meeting_identifier (save_events dedups them)
         conn: Database connection
         
     Returns:
-        row_id of inserted/updated record
+        Count of events written
     """
+    if not rows:
+        return 0
+    
     cursor = None
     
     try:
         cursor = conn.cursor()
-        
-        # Check if event exists
-        check_query = """
-            SELECT row_id FROM insightly_meeting.gcalendar 
-            WHERE id = %(id)s AND organizationid = %(organizationid)s
-            LIMIT 1
-        """
-        
-        # Insert query
-        insert_query = """
-            INSERT INTO insightly_meeting.gcalendar (
-                id, kind, status, summary,
-                creator_email, organizer_email,
-                start_date_time, start_timezone,
-                end_date_time, end_timezone,
-                recurringeventid, eventtype,
-                attendees, organizationid, source_email,
-                visibility, processing_status,
-                createddate, modifieddate
-            ) VALUES (
-                %(id)s, %(kind)s, %(status)s, %(summary)s,
-                %(creator_email)s, %(organizer_email)s,
-                %(start_date_time)s, %(start_timezone)s,
-                %(end_date_time)s, %(end_timezone)s,
-                %(recurringeventid)s, %(eventtype)s,
-                %(attendees)s, %(organizationid)s, %(source_email)s,
-                %(visibility)s, %(processing_status)s,
-                NOW(), NOW()
-            )
-            RETURNING row_id
-        """
-        
-        # Update query
-        update_query = """
-            UPDATE insightly_meeting.gcalendar SET
-                status = %(status)s,
-                summary = %(summary)s,
-                creator_email = %(creator_email)s,
-                organizer_email = %(organizer_email)s,
-                start_date_time = %(start_date_time)s,
-                end_date_time = %(end_date_time)s,
-                attendees = %(attendees)s,
-                source_email = %(source_email)s,
-                modifieddate = NOW()
-            WHERE id = %(id)s AND organizationid = %(organizationid)s
-            RETURNING row_id
-        """
-        
-        # Check if exists
-        cursor.execute(check_query, event_data)
-        existing = cursor.fetchone()
-        
-        if existing:
-            cursor.execute(update_query, event_data)
-            row_id = cursor.fetchone()[0]
-        else:
-            cursor.execute(insert_query, event_data)
-            row_id = cursor.fetchone()[0]
-        
-        conn.commit()
-        return row_id
+        await cursor.executemany(GCAL_EVENT_UPSERT_QUERY, rows)
+        return len(rows)
         
     except Exception as e:
-        logger.error(f"Error upserting gcalendar {event_data.get('id')}: {e}")
-        conn.rollback()
+        logger.error("Error batch upserting %s gcal_event rows: %s", len(rows), e)
         raise
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
+
+
+# Bulk path for large saves: COPY rows into a per-connection temp staging
+# table, then upsert them with one INSERT ... SELECT ... ON CONFLICT.
+# Staging tables copy the target column types (no constraints/defaults)
+# and are emptied on commit. Columns are copied in the order listed.
+GCALENDAR_COPY_COLUMNS = (
+    'id', 'kind', 'status', 'summary',
+    'creator_email', 'organizer_email',
+    'start_date_time', 'start_timezone',
+    'end_date_time', 'end_timezone',
+    'recurringeventid', 'eventtype',
+    'attendees', 'organizationid', 'source_email',
+    'visibility', 'processing_status'
+)
+
+GCALENDAR_STAGING_QUERY = """
+    CREATE TEMP TABLE IF NOT EXISTS staging_gcalendar ON COMMIT DELETE ROWS AS
+    SELECT id, kind, status, summary,
+           creator_email, organizer_email,
+           start_date_time, start_timezone,
+           end_date_time, end_timezone,
+           recurringeventid, eventtype,
+           attendees, organizationid, source_email,
+           visibility, processing_status
+    FROM insightly_meeting.gcalendar
+    WITH NO DATA
+"""
+
+GCALENDAR_COPY_QUERY = """
+    COPY staging_gcalendar (
+        id, kind, status, summary,
+        creator_email, organizer_email,
+        start_date_time, start_timezone,
+        end_date_time, end_timezone,
+        recurringeventid, eventtype,
+        attendees, organizationid, source_email,
+        visibility, processing_status
+    ) FROM STDIN
+"""
 
+GCALENDAR_MERGE_QUERY = """
+    INSERT INTO insightly_meeting.gcalendar (
+        id, kind, status, summary,
+        creator_email, organizer_email,
+        start_date_time, start_timezone,
+        end_date_time, end_timezone,
+        recurringeventid, eventtype,
+        attendees, organizationid, source_email,
+        visibility, processing_status,
+        createddate, modifieddate
+    )
+    SELECT id, kind, status, summary,
+           creator_email, organizer_email,
+           start_date_time, start_timezone,
+           end_date_time, end_timezone,
+           recurringeventid, eventtype,
+           attendees, organizationid, source_email,
+           visibility, processing_status,
+           NOW(), NOW()
+    FROM staging_gcalendar
+    ON CONFLICT (id, organizationid) DO UPDATE SET
+        status = EXCLUDED.status,
+        summary = EXCLUDED.summary,
+        creator_email = EXCLUDED.creator_email,
+        organizer_email = EXCLUDED.organizer_email,
+        start_date_time = EXCLUDED.start_date_time,
+        end_date_time = EXCLUDED.end_date_time,
+        attendees = EXCLUDED.attendees,
+        modifieddate = NOW()
+    WHERE (
+        gcalendar.status, gcalendar.summary,
+        gcalendar.creator_email, gcalendar.organizer_email,
+        gcalendar.start_date_time, gcalendar.end_date_time,
+        gcalendar.attendees::text
+    ) IS DISTINCT FROM (
+        EXCLUDED.status, EXCLUDED.summary,
+        EXCLUDED.creator_email, EXCLUDED.organizer_email,
+        EXCLUDED.start_date_time, EXCLUDED.end_date_time,
+        EXCLUDED.attendees::text
+    )
+"""
+
+GCAL_EVENT_COPY_COLUMNS = (
+    'meeting_identifier', 'title', 'description',
+    'created_by', 'start_date_time', 'end_date_time',
+    'attendees', 'accepted_by', 'meeting_type',
+    'organizationid', 'attendees_data'
+)
+
+GCAL_EVENT_STAGING_QUERY = """
+    CREATE TEMP TABLE IF NOT EXISTS staging_gcal_event ON COMMIT DELETE ROWS AS
+    SELECT meeting_identifier, title, description,
+           created_by, start_date_time, end_date_time,
+           attendees, accepted_by, meeting_type,
+           organizationid, attendees_data
+    FROM insightly_meeting.gcal_event
+    WITH NO DATA
+"""
+
+GCAL_EVENT_COPY_QUERY = """
+    COPY staging_gcal_event (
+        meeting_identifier, title, description,
+        created_by, start_date_time, end_date_time,
+        attendees, accepted_by, meeting_type,
+        organizationid, attendees_data
+    ) FROM STDIN
+"""
+
+GCAL_EVENT_MERGE_QUERY = """
+    INSERT INTO insightly_meeting.gcal_event (
+        meeting_identifier, title, description,
+        created_by, start_date_time, end_date_time,
+        attendees, accepted_by, meeting_type,
+        created_on, updated_on, organizationid,
+        attendees_data
+    )
+    SELECT meeting_identifier, title, description,
+           created_by, start_date_time, end_date_time,
+           attendees, accepted_by, meeting_type,
+           NOW(), NOW(), organizationid,
+           attendees_data
+    FROM staging_gcal_event
+    ON CONFLICT (meeting_identifier, organizationid) DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        start_date_time = EXCLUDED.start_date_time,
+        end_date_time = EXCLUDED.end_date_time,
+        attendees = EXCLUDED.attendees,
+        accepted_by = EXCLUDED.accepted_by,
+        attendees_data = EXCLUDED.attendees_data,
+        updated_on = NOW()
+    WHERE (
+        gcal_event.title, gcal_event.description,
+        gcal_event.start_date_time, gcal_event.end_date_time,
+        gcal_event.attendees, gcal_event.accepted_by,
+        gcal_event.attendees_data::text
+    ) IS DISTINCT FROM (
+        EXCLUDED.title, EXCLUDED.description,
+        EXCLUDED.start_date_time, EXCLUDED.end_date_time,
+        EXCLUDED.attendees, EXCLUDED.accepted_by,
+        EXCLUDED.attendees_data::text
+    )
+"""
 
-def insert_gcal_event(event_data, conn):
+
+async def _copy_upsert(rows, columns, staging_query, copy_query, merge_query, conn):
+    """
+    Stage rows with COPY and upsert them in one statement (see above).
+    rows must already be unique on the conflict key. Not usable inside
+    a pipeline (psycopg doesn't support COPY in pipeline mode).
     """
-    Insert or update a calendar event in insightly_meeting.gcal_event.
+    async with conn.cursor() as cursor:
+        await cursor.execute(staging_query)
+        async with cursor.copy(copy_query) as copy:
+            for row in rows:
+                await copy.write_row(tuple(row[column] for column in columns))
+        await cursor.execute(merge_query)
+    return len(rows)
+
+
+async def copy_gcalendar_batch(rows, conn):
+    """
+    Bulk version of insert_gcalendar_batch for large saves: COPY into
+    staging_gcalendar, then one upsert into insightly_meeting.gcalendar.
+    The caller commits.
     
     Args:
-        event_data: Dictionary with event fields
+        rows: List of GCALENDAR_UPSERT_QUERY param dicts,
+            unique on id (save_events dedups them)
         conn: Database connection
         
     Returns:
-        id of inserted/updated record
+        Count of events written
     """
-    cursor = None
+    if not rows:
+        return 0
     
     try:
-        cursor = conn.cursor()
-        
-        # Check if event exists
-        check_query = """
-            SELECT id FROM insightly_meeting.gcal_event 
-            WHERE meeting_identifier = %(meeting_identifier)s AND organizationid = %(organizationid)s
-            LIMIT 1
-        """
-        
-        # Insert query
-        insert_query = """
-            INSERT INTO insightly_meeting.gcal_event (
-                meeting_identifier, title, description,
-                created_by, start_date_time, end_date_time,
-                attendees, accepted_by, meeting_type,
-                created_on, updated_on, organizationid,
-                attendees_data
-            ) VALUES (
-                %(meeting_identifier)s, %(title)s, %(description)s,
-                %(created_by)s, %(start_date_time)s, %(end_date_time)s,
-                %(attendees)s, %(accepted_by)s, %(meeting_type)s,
-                NOW(), NOW(), %(organizationid)s,
-                %(attendees_data)s
-            )
-            RETURNING id
-        """
-        
-        # Update query
-        update_query = """
-            UPDATE insightly_meeting.gcal_event SET
-                title = %(title)s,
-                description = %(description)s,
-                start_date_time = %(start_date_time)s,
-                end_date_time = %(end_date_time)s,
-                attendees = %(attendees)s,
-                accepted_by = %(accepted_by)s,
-                attendees_data = %(attendees_data)s,
-                updated_on = NOW()
-            WHERE meeting_identifier = %(meeting_identifier)s AND organizationid = %(organizationid)s
-            RETURNING id
-        """
-        
-        # Check if exists
-        cursor.execute(check_query, event_data)
-        existing = cursor.fetchone()
+        return await _copy_upsert(
+            rows, GCALENDAR_COPY_COLUMNS,
+            GCALENDAR_STAGING_QUERY, GCALENDAR_COPY_QUERY, GCALENDAR_MERGE_QUERY,
+            conn
+        )
+    except Exception as e:
+        logger.error("Error bulk upserting %s gcalendar rows: %s", len(rows), e)
+        raise
+
+
+async def copy_gcal_event_batch(rows, conn):
+    """
+    Bulk version of insert_gcal_event_batch for large saves: COPY into
+    staging_gcal_event, then one upsert into insightly_meeting.gcal_event.
+    The caller commits.
+    
+    Args:
+        rows: List of GCAL_EVENT_UPSERT_QUERY param dicts,
+            unique on meeting_identifier (save_events dedups them)
+        conn: Database connection
         
-        if existing:
-            cursor.execute(update_query, event_data)
-            record_id = cursor.fetchone()[0]
-        else:
-            cursor.execute(insert_query, event_data)
-            record_id = cursor.fetchone()[0]
+    Returns:
+        Count of events written
+    """
+    if not rows:
+        return 0
+    
+    try:
+        return await _copy_upsert(
+            rows, GCAL_EVENT_COPY_COLUMNS,
+            GCAL_EVENT_STAGING_QUERY, GCAL_EVENT_COPY_QUERY, GCAL_EVENT_MERGE_QUERY,
+            conn
+        )
+    except Exception as e:
+        logger.error("Error bulk upserting %s gcal_event rows: %s", len(rows), e)
+        raise
+
+
+# Deleted events (incremental syncs): Google only sends a stub with
+# {id, etag, status: "cancelled"}, so they must not go through the
+# full-row upserts. Mark the stored gcalendar row cancelled and drop the
+# normalized gcal_event row. Only the organizer's calendar, or the
+# calendar the row was stored from, can cancel a meeting: an attendee
+# removed from a meeting also sees it as cancelled in their own calendar.
+GCAL_CANCEL_QUERY = """
+    WITH cancelled AS (
+        UPDATE insightly_meeting.gcalendar
+        SET status = 'cancelled', modifieddate = NOW()
+        WHERE id = %(id)s
+          AND organizationid = %(organizationid)s
+          AND status IS DISTINCT FROM 'cancelled'
+          AND (organizer_email = %(source_email)s OR source_email = %(source_email)s)
+        RETURNING id, organizationid
+    )
+    DELETE FROM insightly_meeting.gcal_event e
+    USING cancelled c
+    WHERE e.meeting_identifier = c.id AND e.organizationid = c.organizationid
+"""
+
+
+async def cancel_events(rows, conn):
+    """
+    Apply deleted-event stubs (see GCAL_CANCEL_QUERY). The caller commits.
+    
+    Args:
+        rows: List of {'id', 'organizationid', 'source_email'} dicts
+        conn: Database connection
         
-        conn.commit()
-        return record_id
+    Returns:
+        Count of stubs applied
+    """
+    if not rows:
+        return 0
+    
+    cursor = None
+    
+    try:
+        cursor = conn.cursor()
+        await cursor.executemany(GCAL_CANCEL_QUERY, rows)
+        return len(rows)
         
     except Exception as e:
-        logger.error(f"Error upserting gcal_event {event_data.get('meeting_identifier')}: {e}")
-        conn.rollback()
+        logger.error("Error cancelling %s events: %s", len(rows), e)
         raise
     finally:
         if cursor:
-            cursor.close()
+            await cursor.close()
+
+
+@dataclass(slots=True)
+class SaveResult:
+    """Outcome of save_events."""
+    
+    # Raw events (one per calendar copy, as fetched) that were written,
+    # so it is comparable with the number of events passed in
+    saved: int
+    # Calendars with at least one event that failed to save; callers
+    # must not advance their sync state past this run
+    failed_calendars: set
 
 
-def save_events(events, org_id):
+async def save_events(events, org_id):
     """
     Save all events to gcalendar, authors, and gcal_event tables.
     
     Flow:
-      1. Insert raw event → gcalendar
-      2. Upsert creator/attendees → authors (get IDs)
-      3. Insert normalized event with author IDs → gcal_event
+      1. Upsert every creator/attendee → authors (one statement, get IDs)
+      2. Split events into chunks of SAVE_CHUNK_SIZE and write them
+         concurrently, each on its own pooled connection/transaction:
+         raw events → gcalendar, normalized events with author IDs → gcal_event
+         (a chunk that fails is retried event by event under SAVEPOINTs)
+    Saves of more than COPY_THRESHOLD events stage each chunk with COPY.
+    
+    Authors are resolved up front so concurrent chunk transactions never
+    upsert the same author rows (which could deadlock). Deleted events
+    (status "cancelled") skip all of this and go through cancel_events.
     
     Args:
         events: List of parsed events from Google Calendar
         org_id: Organization ID
         
+    Events that fail to prepare or to save are logged and skipped, and
+    every calendar that had a copy of them is reported back.
+    
     Returns:
-        Count of saved events
+        SaveResult (count of saved events, calendars with failed events).
+        Events are counted per copy, like the input: with no failures,
+        saved == len(events).
     """
-    conn = get_connection()
-    saved_count = 0
+    failed_calendars = set()
+    prepared, cancelled = _prepare_events(events, org_id, failed_calendars)
     
-    try:
-        for event in events:
+    cancelled_count = 0
+    if cancelled:
+        # Stubs whose id has a live copy are counted with that copy
+        live_ids = {pe.id for pe in prepared}
+        async with get_connection() as conn:
             try:
-                # Extract nested fields from raw Google Calendar API format
-                start = event.get('start', {})
-                end = event.get('end', {})
-                creator = event.get('creator', {})
-                organizer = event.get('organizer', {})
-                
-                # Start/end can be dateTime or date (all-day events)
-                start_time = start.get('dateTime') or start.get('date')
-                end_time = end.get('dateTime') or end.get('date')
-                start_timezone = start.get('timeZone', 'UTC')
-                end_timezone = end.get('timeZone', 'UTC')
-                
-                # Creator/organizer emails
-                creator_email = creator.get('email')
-                organizer_email = organizer.get('email')
-                
-                # Prepare data for gcalendar table
-                raw_attendees = event.get('attendees', [])
-                
-                # Normalize attendees to match expected DB format (all fields, nulls for missing)
-                attendees = []
-                for a in raw_attendees:
-                    attendees.append({
-                        'email': a.get('email'),
-                        'responseStatus': a.get('responseStatus'),
-                        'organizer': a.get('organizer'),
-                        'self': a.get('self'),
-                        'displayName': a.get('displayName'),
-                        'optional': a.get('optional'),
-                        'comment': a.get('comment'),
-                        'resource': a.get('resource')
-                    })
-                
-                attendees_json = json.dumps(attendees)
-                
-                gcalendar_data = {
-                    'id': event.get('id'),
-                    'kind': event.get('kind', 'calendar#event'),
-                    'status': event.get('status', 'confirmed'),
-                    'summary': event.get('summary'),
-                    'creator_email': creator_email,
-                    'organizer_email': organizer_email or creator_email,
-                    'start_date_time': start_time,
-                    'start_timezone': start_timezone,
-                    'end_date_time': end_time,
-                    'end_timezone': end_timezone,
-                    'recurringeventid': event.get('recurringEventId'),
-                    'eventtype': event.get('eventType', 'default'),
-                    'attendees': attendees_json,
-                    'organizationid': org_id,
-                    'source_email': event.get('source_email'),
-                    'visibility': event.get('visibility', 'default'),
-                    'processing_status': 'COMPLETED'
-                }
-                
-                # Step 1: Insert raw event to gcalendar
-                insert_gcalendar(gcalendar_data, conn)
-                
-                # Step 2: Upsert authors and get IDs
-                # Creator
-                creator_id = insert_user(
-                    creator_email,
-                    org_id,
-                    conn
+                await cancel_events(cancelled, conn)
+                await conn.commit()
+                cancelled_count = sum(
+                    1 for event in events
+                    if event.get('status') == 'cancelled' and event.get('id') not in live_ids
                 )
-                
-                # All attendees
-                attendee_ids = []
-                accepted_ids = []
-                for attendee in attendees:
-                    author_id = insert_user(
-                        attendee.get('email'),
-                        org_id,
-                        conn
-                    )
-                    if author_id:
-                        attendee_ids.append(str(author_id))
-                        # Check if accepted (responseStatus == 'accepted')
-                        if attendee.get('responseStatus') == 'accepted':
-                            accepted_ids.append(str(author_id))
-                
-                # Step 3: Prepare data for gcal_event table with author IDs
-                gcal_event_data = {
-                    'meeting_identifier': event.get('id'),
-                    'title': event.get('summary'),
-                    'description': event.get('description'),
-                    'created_by': creator_id,  # Using author ID
-                    'start_date_time': start_time,
-                    'end_date_time': end_time,
-                    'attendees': '{' + ','.join(attendee_ids) + '}',  # PostgreSQL array format
-                    'accepted_by': '{' + ','.join(accepted_ids) + '}',  # PostgreSQL array format
-                    'meeting_type': event.get('eventType', 'default'),
-                    'organizationid': org_id,
-                    'attendees_data': attendees_json  # Keep raw JSON for reference
-                }
-                
-                # Insert normalized event to gcal_event
-                insert_gcal_event(gcal_event_data, conn)
-                
-                saved_count += 1
-                
+            except Exception:
+                await conn.rollback()
+                raise
+    
+    if not prepared:
+        return SaveResult(cancelled_count, failed_calendars)
+    
+    # Creators and attendees repeat across events (and within one);
+    # resolve each distinct email once
+    emails = set()
+    for pe in prepared:
+        emails.add(pe.creator_email)
+        emails.update(a.get('email') for a in pe.attendees)
+    emails.discard(None)
+    
+    async with get_connection() as conn:
+        try:
+            author_ids = await upsert_authors(emails, org_id, conn)
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            # Author ids cached during this transaction may not exist
+            invalidate_author_cache(org_id)
+            raise
+    
+    use_copy = len(prepared) > COPY_THRESHOLD
+    semaphore = asyncio.Semaphore(SAVE_CONCURRENCY)
+    
+    async def save_chunk(chunk):
+        # One connection per task: psycopg connections can't run
+        # concurrent statements
+        async with semaphore, get_connection() as conn:
+            try:
+                saved = await _save_chunk(
+                    chunk, author_ids, org_id, conn, use_copy
+                )
+                await conn.commit()
+                return saved
             except Exception as e:
-                logger.error(f"Error saving event {event.get('id')}: {e}")
-                continue
-        
-        print(f"✅ Saved {saved_count}/{len(events)} events to database")
-        return saved_count
+                await conn.rollback()
+                logger.warning(
+                    "Batch save of %s events failed (%s); retrying one event at a time",
+                    len(chunk), e
+                )
+            
+            # One transaction, one SAVEPOINT per event: a bad event is
+            # rolled back on its own instead of failing the whole chunk
+            saved = 0
+            async with conn.transaction():
+                for item in chunk:
+                    try:
+                        async with conn.transaction():
+                            saved += await _save_chunk([item], author_ids, org_id, conn)
+                    except Exception as e:
+                        logger.error("Error saving event %s: %s", item.id, e)
+                        failed_calendars.update(item.sources)
+            return saved
+    
+    counts = await asyncio.gather(*(
+        save_chunk(prepared[i:i + SAVE_CHUNK_SIZE])
+        for i in range(0, len(prepared), SAVE_CHUNK_SIZE)
+    ))
+    saved_count = sum(counts) + cancelled_count
+    
+    # Callers log the totals; per-batch detail only at DEBUG
+    logger.debug("✅ Saved %s/%s events to database", saved_count, len(events))
+    return SaveResult(saved_count, failed_calendars)
+
+
+@dataclass(slots=True)
+class PreparedEvent:
+    """One event ready to write: its gcalendar row plus what gcal_event needs."""
+    
+    id: Optional[str]
+    title: Optional[str]
+    description: Optional[str]
+    event_type: str
+    start_time: Optional[str]
+    end_time: Optional[str]
+    creator_email: Optional[str]
+    attendees: list  # as received from Google
+    attendees_json: str
+    gcalendar: dict  # GCALENDAR_UPSERT_QUERY params
+    sources: list  # every calendar this event was fetched from
+
+
+def _prepare_events(events, org_id, failed_calendars):
+    """
+    Build a PreparedEvent per event for save_events (one pass over each
+    raw event's dicts). The same event shows up in every attendee's
+    calendar; the last copy wins, and every copy's calendar (deleted-event
+    stubs included) is kept in its sources. Sorted by event id so chunks are
+    disjoint and rows are locked in a consistent order. Calendars of
+    events that can't be prepared are added to failed_calendars.
+    
+    Returns:
+        (prepared events, cancel_events rows for deleted-event stubs
+        whose id has no live copy in this batch)
+    """
+    prepared = {}
+    sources = {}
+    cancelled = {}
+    for event in events:
+        if event.get('status') == 'cancelled':
+            key = (event.get('id'), event.get('source_email'))
+            cancelled[key] = {'id': key[0], 'organizationid': org_id, 'source_email': key[1]}
+            sources.setdefault(key[0], []).append(key[1])
+            continue
+        try:
+            # Extract nested fields from raw Google Calendar API format
+            start = event.get('start', {})
+            end = event.get('end', {})
+            creator_email = event.get('creator', {}).get('email')
+            organizer_email = event.get('organizer', {}).get('email')
+            
+            # Start/end can be dateTime or date (all-day events)
+            start_time = start.get('dateTime') or start.get('date')
+            end_time = end.get('dateTime') or end.get('date')
+            event_type = event.get('eventType', 'default')
+            
+            # Stored as Google sent them; JSONB readers treat missing keys as null
+            attendees = event.get('attendees', [])
+            attendees_json = orjson.dumps(attendees).decode()  # str: bytes would bind as bytea
+            
+            # Prepare data for gcalendar table
+            gcalendar_data = {
+                'id': event.get('id'),
+                'kind': event.get('kind', 'calendar#event'),
+                'status': event.get('status', 'confirmed'),
+                'summary': event.get('summary'),
+                'creator_email': creator_email,
+                'organizer_email': organizer_email or creator_email,
+                'start_date_time': start_time,
+                'start_timezone': start.get('timeZone', 'UTC'),
+                'end_date_time': end_time,
+                'end_timezone': end.get('timeZone', 'UTC'),
+                'recurringeventid': event.get('recurringEventId'),
+                'eventtype': event_type,
+                'attendees': attendees_json,
+                'organizationid': org_id,
+                'source_email': event.get('source_email'),
+                'visibility': event.get('visibility', 'default'),
+                'processing_status': 'COMPLETED'
+            }
+            
+            pe = PreparedEvent(
+                id=gcalendar_data['id'],
+                title=gcalendar_data['summary'],
+                description=event.get('description'),
+                event_type=event_type,
+                start_time=start_time,
+                end_time=end_time,
+                creator_email=creator_email,
+                attendees=attendees,
+                attendees_json=attendees_json,
+                gcalendar=gcalendar_data,
+                sources=sources.setdefault(gcalendar_data['id'], [])
+            )
+            pe.sources.append(gcalendar_data['source_email'])
+            
+            prepared[pe.id] = pe
+            
+        except Exception as e:
+            logger.error("Error preparing event %s: %s", event.get('id'), e)
+            failed_calendars.add(event.get('source_email'))
+            continue
+    
+    return (
+        [prepared[event_id] for event_id in sorted(prepared, key=str)],
+        [row for (event_id, _), row in cancelled.items() if event_id not in prepared]
+    )
+
+
+async def _save_chunk(chunk, author_ids, org_id, conn, use_copy=False):
+    """
+    Write one chunk of PreparedEvents on conn without committing.
+    Both batches go out in one pipeline, so the gcal_event upserts are
+    sent without waiting on the gcalendar results. With use_copy, rows
+    are bulk-loaded via COPY instead (COPY can't run in a pipeline).
+    """
+    gcal_event_rows = []
+    for pe in chunk:
+        # All attendees
+        attendee_ids = []
+        accepted_ids = []
+        for attendee in pe.attendees:
+            author_id = author_ids.get(attendee.get('email'))
+            if author_id:
+                attendee_ids.append(author_id)
+                # Check if accepted (responseStatus == 'accepted')
+                if attendee.get('responseStatus') == 'accepted':
+                    accepted_ids.append(author_id)
         
-    finally:
-        conn.close()
+        # Prepare data for gcal_event table with author IDs
+        gcal_event_rows.append({
+            'meeting_identifier': pe.id,
+            'title': pe.title,
+            'description': pe.description,
+            'created_by': author_ids.get(pe.creator_email),  # Using author ID
+            'start_date_time': pe.start_time,
+            'end_date_time': pe.end_time,
+            'attendees': attendee_ids,  # list -> PostgreSQL array (adapted by psycopg)
+            'accepted_by': accepted_ids,
+            'meeting_type': pe.event_type,
+            'organizationid': org_id,
+            'attendees_data': pe.attendees_json  # Keep raw JSON for reference
+        })
+    
+    if use_copy:
+        await copy_gcalendar_batch([pe.gcalendar for pe in chunk], conn)
+        await copy_gcal_event_batch(gcal_event_rows, conn)
+    else:
+        async with conn.pipeline():
+            # Upsert raw events to gcalendar in one batch
+            await insert_gcalendar_batch([pe.gcalendar for pe in chunk], conn)
+            # Upsert normalized events to gcal_event in one batch
+            await insert_gcal_event_batch(gcal_event_rows, conn)
+    # Count every fetched copy (see SaveResult.saved)
+    return sum(len(pe.sources) for pe in chunk)
 
 
 INTEGRATION_TYPE = 'GOOGLE_CALENDAR'  # Matches auth-svc provider constant
 
 
-def save_integration_tokens(org_id, access_token, refresh_token, expires_in, email=None):
+async def save_integration_tokens(org_id, access_token, refresh_token, expires_in, email=None):
     """
     Save tokens to user_integration_details table.
-    Uses INSERT on first auth, UPDATE on subsequent.
+    Single INSERT ... ON CONFLICT upsert (inserts on first auth, updates after).
+    Requires the unique index from migrations/001_user_integration_details_unique.sql.
     
     Args:
         org_id: Organization ID
@@ -440,51 +874,13 @@ def save_integration_tokens(org_id, access_token, refresh_token, expires_in, ema
         expires_in: Token expiry time (seconds or datetime)
         email: User's email
     """
-    conn = None
-    cursor = None
-    
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Check if record exists
-        check_query = """
-            SELECT id FROM insightly.user_integration_details
-            WHERE organizationid = %(org_id)s
-              AND provider = %(provider)s
-            LIMIT 1
-        """
-        
-        cursor.execute(check_query, {
-            'org_id': org_id,
-            'provider': INTEGRATION_TYPE
-        })
-        
-        existing = cursor.fetchone()
+    async with get_connection() as conn:
+        cursor = None
         
-        if existing:
-            # Update existing record
-            update_query = """
-                UPDATE insightly.user_integration_details
-                SET accesstoken = aes_encrypt(%(access_token)s),
-                    refreshtoken = aes_encrypt(%(refresh_token)s),
-                    expiresin = %(expires_in)s,
-                    access_token_generation_date = NOW(),
-                    modifieddate = NOW()
-                WHERE organizationid = %(org_id)s
-                  AND provider = %(provider)s
-            """
-            cursor.execute(update_query, {
-                'access_token': access_token,
-                'refresh_token': refresh_token,
-                'expires_in': expires_in,
-                'org_id': org_id,
-                'provider': INTEGRATION_TYPE
-            })
-            print(f"✅ Updated tokens in DB for org {org_id}")
-        else:
-            # Insert new record
-            insert_query = """
+        try:
+            cursor = conn.cursor()
+            
+            upsert_query = """
                 INSERT INTO insightly.user_integration_details (
                     organizationid, provider, accesstoken, refreshtoken,
                     expiresin, email, access_token_generation_date,
@@ -494,8 +890,14 @@ def save_integration_tokens(org_id, access_token, refresh_token, expires_in, ema
                     aes_encrypt(%(access_token)s), aes_encrypt(%(refresh_token)s),
                     %(expires_in)s, %(email)s, NOW(), NOW(), NOW()
                 )
+                ON CONFLICT (organizationid, provider) DO UPDATE
+                SET accesstoken = EXCLUDED.accesstoken,
+                    refreshtoken = EXCLUDED.refreshtoken,
+                    expiresin = EXCLUDED.expiresin,
+                    access_token_generation_date = NOW(),
+                    modifieddate = NOW()
             """
-            cursor.execute(insert_query, {
+            await cursor.execute(upsert_query, {
                 'org_id': org_id,
                 'provider': INTEGRATION_TYPE,
                 'access_token': access_token,
@@ -503,73 +905,234 @@ def save_integration_tokens(org_id, access_token, refresh_token, expires_in, ema
                 'expires_in': expires_in,
                 'email': email
             })
-            print(f"✅ Saved tokens in DB for org {org_id}")
-        
-        conn.commit()
-        return True
-        
-    except Exception as e:
-        logger.error(f"Error saving tokens for org {org_id}: {e}")
-        if conn:
-            conn.rollback()
-        raise
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+            logger.info("✅ Saved tokens in DB for org %s", org_id)
+            
+            await conn.commit()
+            return True
+            
+        except Exception as e:
+            logger.error("Error saving tokens for org %s: %s", org_id, e)
+            await conn.rollback()
+            raise
+        finally:
+            if cursor:
+                await cursor.close()
 
 
-def get_integration_tokens(org_id):
+async def get_integration_tokens(org_id):
     """
     Get tokens from user_integration_details table.
     
     Returns:
-        dict with token, refresh_token, expires_in, access_token_generation_date, email
-        or None if not found
+        dict with token, refresh_token, expires_in, access_token_generation_date,
+        email, expires_at (timezone-aware) or None if not found
     """
-    conn = None
-    cursor = None
-    
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+    async with get_connection() as conn:
+        cursor = None
         
-        query = """
-            SELECT 
-                aes_decrypt(accesstoken) as token,
-                aes_decrypt(refreshtoken) as refresh_token,
-                expiresin,
-                access_token_generation_date,
-                email
-            FROM insightly.user_integration_details
-            WHERE organizationid = %(org_id)s
-              AND provider = %(provider)s
-            LIMIT 1
-        """
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT 
+                    aes_decrypt(accesstoken) as token,
+                    aes_decrypt(refreshtoken) as refresh_token,
+                    expiresin,
+                    access_token_generation_date,
+                    email,
+                    -- timestamptz comes back timezone-aware, whatever the session time zone
+                    (access_token_generation_date
+                        + make_interval(secs => COALESCE(expiresin, 3600)))::timestamptz as expires_at
+                FROM insightly.user_integration_details
+                WHERE organizationid = %(org_id)s
+                  AND provider = %(provider)s
+                LIMIT 1
+            """
+            
+            await cursor.execute(query, {
+                'org_id': org_id,
+                'provider': INTEGRATION_TYPE
+            })
+            
+            row = await cursor.fetchone()
+            
+            if row:
+                return {
+                    'token': row[0],
+                    'refresh_token': row[1],
+                    'expires_in': row[2],
+                    'access_token_generation_date': row[3],
+                    'email': row[4],
+                    'expires_at': row[5]
+                }
+            return None
+            
+        except Exception as e:
+            logger.error("Error getting tokens for org %s: %s", org_id, e)
+            raise
+        finally:
+            if cursor:
+                await cursor.close()
+
+
+async def get_sync_tokens(org_id):
+    """
+    Get stored Google Calendar sync tokens for an organization.
+    
+    Returns:
+        dict of calendar ID -> sync token (empty if none stored)
+    """
+    async with get_connection() as conn:
+        cursor = None
         
-        cursor.execute(query, {
-            'org_id': org_id,
-            'provider': INTEGRATION_TYPE
-        })
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT calendar_id, sync_token
+                FROM insightly_meeting.gcal_sync_token
+                WHERE organizationid = %(org_id)s
+            """
+            
+            await cursor.execute(query, {'org_id': org_id})
+            rows = await cursor.fetchall()
+            
+            return {row[0]: row[1] for row in rows}
+            
+        except Exception as e:
+            logger.error("Error getting sync tokens for org %s: %s", org_id, e)
+            raise
+        finally:
+            if cursor:
+                await cursor.close()
+
+
+async def get_last_sync_times(org_id):
+    """
+    Get when the last complete fetch of each calendar started
+    (insightly_meeting.gcal_sync_run, see save_last_sync_times).
+    Used as updatedMin for calendars without a sync token, so their first
+    incremental fetch only returns events modified since then.
+    
+    Returns:
+        dict of calendar ID -> last run start (aware datetime)
+    """
+    async with get_connection() as conn:
+        cursor = None
         
-        row = cursor.fetchone()
+        try:
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT calendar_id, last_run_ts
+                FROM insightly_meeting.gcal_sync_run
+                WHERE organizationid = %(org_id)s
+            """
+            
+            await cursor.execute(query, {'org_id': org_id})
+            rows = await cursor.fetchall()
+            
+            return {row[0]: row[1] for row in rows}
+            
+        except Exception as e:
+            logger.error("Error getting last sync times for org %s: %s", org_id, e)
+            raise
+        finally:
+            if cursor:
+                await cursor.close()
+
+
+async def save_sync_tokens(org_id, sync_tokens):
+    """
+    Save Google Calendar sync tokens (one row per calendar).
+    
+    Args:
+        org_id: Organization ID
+        sync_tokens: dict of calendar ID -> sync token
+    """
+    if not sync_tokens:
+        return
+    
+    async with get_connection() as conn:
+        cursor = None
         
-        if row:
-            return {
-                'token': row[0],
-                'refresh_token': row[1],
-                'expires_in': row[2],
-                'access_token_generation_date': row[3],
-                'email': row[4]
-            }
-        return None
+        try:
+            cursor = conn.cursor()
+            
+            upsert_query = """
+                INSERT INTO insightly_meeting.gcal_sync_token (
+                    organizationid, calendar_id, sync_token,
+                    createddate, modifieddate
+                ) VALUES (
+                    %(org_id)s, %(calendar_id)s, %(sync_token)s,
+                    NOW(), NOW()
+                )
+                ON CONFLICT (organizationid, calendar_id) DO UPDATE
+                SET sync_token = EXCLUDED.sync_token,
+                    modifieddate = NOW()
+            """
+            
+            await cursor.executemany(upsert_query, [
+                {'org_id': org_id, 'calendar_id': calendar_id, 'sync_token': sync_token}
+                for calendar_id, sync_token in sync_tokens.items()
+            ])
+            
+            await conn.commit()
+            
+        except Exception as e:
+            logger.error("Error saving sync tokens for org %s: %s", org_id, e)
+            await conn.rollback()
+            raise
+        finally:
+            if cursor:
+                await cursor.close()
+
+
+async def save_last_sync_times(org_id, calendar_ids, run_started):
+    """
+    Record the start time of a sync run for calendars it fully fetched
+    and saved. Must be the time the fetch *started*: an event edited
+    while the run was in flight then still has updated >= last_run_ts
+    and is picked up by the next updatedMin fetch.
+    
+    Args:
+        org_id: Organization ID
+        calendar_ids: Calendars whose every page was fetched and saved
+        run_started: When the run began fetching from Google (aware datetime)
+    """
+    if not calendar_ids:
+        return
+    
+    async with get_connection() as conn:
+        cursor = None
         
-    except Exception as e:
-        logger.error(f"Error getting tokens for org {org_id}: {e}")
-        raise
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+        try:
+            cursor = conn.cursor()
+            
+            upsert_query = """
+                INSERT INTO insightly_meeting.gcal_sync_run (
+                    organizationid, calendar_id, last_run_ts,
+                    createddate, modifieddate
+                ) VALUES (
+                    %(org_id)s, %(calendar_id)s, %(last_run_ts)s,
+                    NOW(), NOW()
+                )
+                ON CONFLICT (organizationid, calendar_id) DO UPDATE
+                SET last_run_ts = GREATEST(gcal_sync_run.last_run_ts, EXCLUDED.last_run_ts),
+                    modifieddate = NOW()
+            """
+            
+            await cursor.executemany(upsert_query, [
+                {'org_id': org_id, 'calendar_id': calendar_id, 'last_run_ts': run_started}
+                for calendar_id in sorted(calendar_ids)
+            ])
+            
+            await conn.commit()
+            
+        except Exception as e:
+            logger.error("Error saving last sync times for org %s: %s", org_id, e)
+            await conn.rollback()
+            raise
+        finally:
+            if cursor:
+                await cursor.close()
@@ -3,8 +3,16 @@ Hivel Calendar Service - Main FastAPI Application
 Google Calendar integration via Marketplace app.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from slowapi.errors import RateLimitExceeded
 from app.api.routes import router
+from app.core.http import close_client
+from app.core.rate_limit import limiter, rate_limit_exceeded_handler
+from app.database.connection import open_pool, close_pool
 from app.core.logger import setup_logging, get_logger
 
 # Initialize logging FIRST
@@ -13,31 +21,43 @@ setup_logging()
 # Get logger for this module
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources before serving; close them on shutdown."""
+    logger.info("🚀 Hivel Calendar Service starting...")
+    await open_pool()
+    logger.info("📅 Google Calendar Marketplace integration ready")
+    try:
+        yield
+    finally:
+        logger.info("👋 Hivel Calendar Service shutting down...")
+        await close_client()
+        await close_pool()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Hivel Calendar Service",
     description="Google Calendar integration via Marketplace",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Include routes
-app.include_router(router)
-
+# Rate limiting (SlowAPI)
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    logger.info("🚀 Hivel Calendar Service starting...")
-    logger.info("📅 Google Calendar Marketplace integration ready")
+# Compress large JSON responses (event lists compress very well)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
-    logger.info("👋 Hivel Calendar Service shutting down...")
+# Include routes
+app.include_router(router)
 
 
 # For running with: python -m app.main
+# (or: uvicorn app.main:app --loop uvloop --http httptools --workers $(nproc))
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
@@ -0,0 +1,6 @@
+-- Unique key for the token upsert in save_integration_tokens
+-- (INSERT ... ON CONFLICT (organizationid, provider)).
+-- Fails if duplicate (organizationid, provider) rows already exist;
+-- dedupe those first.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS user_integration_details_org_provider_uidx
+    ON insightly.user_integration_details (organizationid, provider);
@@ -0,0 +1,10 @@
+-- Per-calendar Google Calendar sync tokens for incremental sync
+-- (events.list?syncToken=...). Used by get_sync_tokens/save_sync_tokens.
+CREATE TABLE IF NOT EXISTS insightly_meeting.gcal_sync_token (
+    organizationid BIGINT NOT NULL,
+    calendar_id    TEXT NOT NULL,
+    sync_token     TEXT NOT NULL,
+    createddate    TIMESTAMP NOT NULL DEFAULT NOW(),
+    modifieddate   TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (organizationid, calendar_id)
+);
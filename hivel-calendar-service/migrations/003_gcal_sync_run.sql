@@ -0,0 +1,11 @@
+-- Per-calendar start time of the last sync run that fully fetched and
+-- saved the calendar. Used as updatedMin for incremental fetches of
+-- calendars without a sync token (get_last_sync_times/save_last_sync_times).
+CREATE TABLE IF NOT EXISTS insightly_meeting.gcal_sync_run (
+    organizationid BIGINT NOT NULL,
+    calendar_id    TEXT NOT NULL,
+    last_run_ts    TIMESTAMPTZ NOT NULL,
+    createddate    TIMESTAMP NOT NULL DEFAULT NOW(),
+    modifieddate   TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (organizationid, calendar_id)
+);
@@ -0,0 +1,41 @@
+-- Deterministic lookup key for insightly.author: sha256 of the email
+-- with ASCII A-Z lowercased.
+-- Lets authors be matched/upserted (ON CONFLICT) by an indexed column
+-- instead of decrypting every row with aes_decrypt(email) = ....
+-- The app computes the same hash (app.database.events.email_hash).
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+ALTER TABLE insightly.author ADD COLUMN IF NOT EXISTS email_hash BYTEA;
+
+-- The one definition of the hash on the DB side. Only ASCII A-Z is
+-- lowercased: lower() follows the collation/locale and can disagree with
+-- the app for non-ASCII addresses; translate() matches the app's
+-- bytes.lower() exactly (digest hashes the UTF-8 database encoding).
+CREATE OR REPLACE FUNCTION insightly.author_email_hash(email TEXT) RETURNS BYTEA AS $$
+    SELECT digest(
+        translate(email, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),
+        'sha256'
+    );
+$$ LANGUAGE sql IMMUTABLE STRICT;
+
+-- Keep email_hash populated for rows written by other services (which
+-- don't know about the column), so lookups by hash in upsert_authors
+-- never miss an existing author. Created before the backfill so rows
+-- written while it runs are covered too.
+CREATE OR REPLACE FUNCTION insightly.author_set_email_hash() RETURNS trigger AS $$
+BEGIN
+    IF NEW.email IS NOT NULL AND (NEW.email_hash IS NULL OR TG_OP = 'UPDATE') THEN
+        NEW.email_hash := insightly.author_email_hash(aes_decrypt(NEW.email));
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS author_set_email_hash ON insightly.author;
+CREATE TRIGGER author_set_email_hash
+    BEFORE INSERT OR UPDATE OF email ON insightly.author
+    FOR EACH ROW EXECUTE FUNCTION insightly.author_set_email_hash();
+
+UPDATE insightly.author
+SET email_hash = insightly.author_email_hash(aes_decrypt(email))
+WHERE email_hash IS NULL AND email IS NOT NULL;
@@ -0,0 +1,7 @@
+-- Unique lookup index for insightly.author.email_hash (see 004).
+-- Kept in its own file: CREATE INDEX CONCURRENTLY can't run inside a
+-- transaction block, so it must not share one with 004.
+-- Fails if the same email exists twice for an (org, provider);
+-- dedupe those first.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS author_email_hash_uidx
+    ON insightly.author (email_hash, scmprovider, organizationid);
@@ -0,0 +1,9 @@
+-- Unique keys for the single-statement upserts in save_events
+-- (INSERT ... ON CONFLICT (id, organizationid) on gcalendar and
+-- ON CONFLICT (meeting_identifier, organizationid) on gcal_event).
+-- Fail if duplicate rows already exist; dedupe those first.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS gcalendar_id_org_uidx
+    ON insightly_meeting.gcalendar (id, organizationid);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS gcal_event_meeting_org_uidx
+    ON insightly_meeting.gcal_event (meeting_identifier, organizationid);
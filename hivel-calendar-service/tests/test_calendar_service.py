@@ -0,0 +1,36 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from app.calendar import service
+
+
+async def fake_calendar_list(access_token):
+    for page in range(5):
+        yield [f"cal{page}_{i}@example.com" for i in range(250)]
+
+
+async def fake_first_pages_batch(access_token, calendar_emails, *args, **kwargs):
+    await asyncio.sleep(0.01)
+    return {
+        email: {"items": [{"id": email}], "pageToken": None, "syncToken": None}
+        for email in calendar_emails
+    }
+
+
+class IterEventsTest(unittest.IsolatedAsyncioTestCase):
+    @mock.patch.object(service, "fetch_first_pages_batch", fake_first_pages_batch)
+    @mock.patch.object(service, "iter_calendar_list", fake_calendar_list)
+    async def test_early_close_leaves_no_tasks(self):
+        for _ in range(3):
+            events = service.iter_events(1, "token", "2024-01-01T00:00:00Z", "2024-02-01T00:00:00Z")
+            async for _event in events:
+                break
+            await events.aclose()
+        
+        leftover = asyncio.all_tasks() - {asyncio.current_task()}
+        self.assertEqual(leftover, set())
+
+
+if __name__ == "__main__":
+    unittest.main()